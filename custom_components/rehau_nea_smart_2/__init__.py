@@ -5,12 +5,19 @@ https://github.com/ludeeus/rehau_nea_smart_2
 """
 from __future__ import annotations
 
+import time
+
 from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 
 from .rehau_mqtt_client.Controller import Controller
-from .const import DOMAIN
+from .rehau_mqtt_client import MqttClient
+from .const import DOMAIN, LOGGER
+from .login_cache import pop_login
+
+STORAGE_VERSION = 1
 
 PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
@@ -21,12 +28,28 @@ PLATFORMS: list[Platform] = [
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up this integration using UI."""
+    """Set up this integration using UI.
 
-    controller = Controller(hass, entry.data[CONF_EMAIL], entry.data[CONF_PASSWORD])
+    When the installations of the last session are stored, the entities are
+    created from them right away and the connection is made in the
+    background, so the startup of Home Assistant does not wait for the cloud.
+    """
+    start = time.monotonic()
+    controller = Controller(
+        hass,
+        entry.data[CONF_EMAIL],
+        entry.data[CONF_PASSWORD],
+        store=get_login_store(hass, entry),
+        initial_login=pop_login(hass, entry.data[CONF_EMAIL]),
+    )
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = controller
-    await controller.connect()
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if await controller.load_snapshot():
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        controller.start_connect()
+    else:
+        await controller.connect()
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    LOGGER.debug("Entities set up in %.3f seconds", time.monotonic() - start)
 
     return True
 
@@ -39,6 +62,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored login and the cached referentials of a removed entry."""
+    await get_login_store(hass, entry).async_remove()
+    await MqttClient.remove_cached_referentials(hass, entry.data[CONF_EMAIL])
+
+
+def get_login_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Get the store of the token and user data of an entry.
+
+    The file is private to the Home Assistant user, Home Assistant does not
+    encrypt its storage.
+    """
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.login", private=True)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -9,10 +9,11 @@ from homeassistant.components.binary_sensor import (
 	BinarySensorEntityDescription,
 )
 
-from .rehau_mqtt_client import Installation, Zone, LiveEmu
+from .rehau_mqtt_client import Installation, Zone, LiveEmu, LIVE_EMU, LIVE_DIDO
 from .rehau_mqtt_client.Controller import Controller
 
 from .const import DOMAIN
+from .entity import StateFingerprintMixin
 
 ENTITY_DESCRIPTIONS = (
 	BinarySensorEntityDescription(
@@ -26,7 +27,7 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
 	"""Set up the binary_sensor platform."""
 	controller: Controller = hass.data[DOMAIN][entry.entry_id]
 
-	installations: list[Installation] = controller.get_installations()
+	installations: tuple[Installation, ...] = controller.get_installations()
 
 	devices = []
 
@@ -92,7 +93,7 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
 	async_add_entities(devices)
 
 
-class RehauNeasmart2BinarySensorForLiveEmu(BinarySensorEntity):
+class RehauNeasmart2BinarySensorForLiveEmu(StateFingerprintMixin, BinarySensorEntity):
 
 	def __init__(self, controller: Controller, live_emu: dict, propertyname: str, name: str, entity_description: SensorEntityDescription):
 		self._live_emu = live_emu
@@ -108,19 +109,23 @@ class RehauNeasmart2BinarySensorForLiveEmu(BinarySensorEntity):
 
 	async def async_added_to_hass(self) -> None:
 		"""Run when this Entity has been added to HA."""
-		self._controller.register_callback(self.async_write_ha_state)
+		self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._installation_unique, live=LIVE_EMU)
 
 	async def async_will_remove_from_hass(self):
 		"""Run when this Entity will be removed from HA."""
-		self._controller.remove_callback(self.async_write_ha_state)
+		self._unsubscribe()
 	
+	def state_fingerprint(self) -> tuple:
+		"""Return the rendered values of the binary sensor state."""
+		return (self.available, self.is_on)
+
 	@property
 	def is_on(self) -> bool:
 		"""Return true if the binary_sensor is on."""
 		live_emu = self._controller.get_live_emu_by_unique(self._installation_unique)
 		return live_emu.get(self._propertyname)
 
-class RehauNeasmart2BinarySensorForLiveDido(BinarySensorEntity):
+class RehauNeasmart2BinarySensorForLiveDido(StateFingerprintMixin, BinarySensorEntity):
 
 	def __init__(self, controller: Controller, live_dido: dict, propertyname: str, name: str, entity_description: SensorEntityDescription):
 		self._live_dido = live_dido
@@ -136,12 +141,16 @@ class RehauNeasmart2BinarySensorForLiveDido(BinarySensorEntity):
 
 	async def async_added_to_hass(self) -> None:
 		"""Run when this Entity has been added to HA."""
-		self._controller.register_callback(self.async_write_ha_state)
+		self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._installation_unique, live=LIVE_DIDO)
 
 	async def async_will_remove_from_hass(self):
 		"""Run when this Entity will be removed from HA."""
-		self._controller.remove_callback(self.async_write_ha_state)
+		self._unsubscribe()
 	
+	def state_fingerprint(self) -> tuple:
+		"""Return the rendered values of the binary sensor state."""
+		return (self.available, self.is_on)
+
 	@property
 	def is_on(self) -> bool:
 		"""Return true if the binary_sensor is on."""
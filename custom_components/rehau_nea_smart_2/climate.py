@@ -1,6 +1,6 @@
 """Platform for climate integration."""
 import logging
-from .rehau_mqtt_client import Installation, Zone
+from .rehau_mqtt_client import Installation, Zone, MqttClientError, fahrenheit_tenths_to_celsius
 from .rehau_mqtt_client.Controller import Controller
 
 from .const import (
@@ -12,6 +12,8 @@ from .const import (
     PRESET_CLIMATE_MODES_MAPPING,
     PRESET_CLIMATE_MODES_MAPPING_REVERSE,
 )
+from .entity import StateFingerprintMixin
+from typing import NamedTuple
 from homeassistant.components.climate import (
     ClimateEntity,
     ClimateEntityDescription,
@@ -39,7 +41,7 @@ ENTITY_DESCRIPTIONS = (
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the climate platform."""
     controller: Controller = hass.data[DOMAIN][entry.entry_id]
-    installations: list[Installation] = controller.get_installations()
+    installations: tuple[Installation, ...] = controller.get_installations()
 
     devices = []
 
@@ -54,7 +56,18 @@ async def async_setup_entry(hass, entry, async_add_devices):
     async_add_devices(devices)
 
 
-class IntegrationRehauNeaSmart2Climate(ClimateEntity, RestoreEntity):
+class ClimateRender(NamedTuple):
+    """The values shown by a climate entity, computed once per zone change."""
+
+    current_temperature: float | None
+    target_temperature: float | None
+    current_humidity: float | None
+    hvac_mode: str | None
+    hvac_action: str | None
+    preset_mode: str | None
+
+
+class IntegrationRehauNeaSmart2Climate(StateFingerprintMixin, ClimateEntity, RestoreEntity):
     """Representation of a Rehau Nea Smart 2 climate entity."""
 
     _attr_has_entity_name = False
@@ -99,11 +112,11 @@ class IntegrationRehauNeaSmart2Climate(ClimateEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._installation_unique, zone_id=self._id)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._unsubscribe()
 
     @property
     def device_info(self):
@@ -150,100 +163,96 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
         self._attr_max_temp = self.format_temperature(self._max_temp)
         self._attr_min_temp = self.format_temperature(self._min_temp)
         self._attr_current_humidity = self._current_humidity
+        self._render = self.render()
+
+    def state_fingerprint(self) -> tuple:
+        """Return the rendered values of the climate state."""
+        return (self.available, self._render)
+
+    def _handle_state_changes(self, changes) -> None:
+        """Render the zone again before writing the state."""
+        self._render = self.render()
+        super()._handle_state_changes(changes)
 
     def format_temperature(self, temperature, round_half=False) -> float:
         """Format the temperature."""
-        converted_temperature = (temperature / 10 - 32) / 1.8
+        return fahrenheit_tenths_to_celsius(temperature, round_half)
+
+    def render(self) -> ClimateRender:
+        """Compute the values shown for the zone, with a single zone lookup.
+
+        Returns:
+            ClimateRender: The rendered values, the previous ones if the zone is not found.
+        """
+        previous = getattr(self, "_render", None)
+        try:
+            zone = self._controller.get_zone(self._id)
+        except MqttClientError:
+            if previous is not None:
+                return previous
+            return ClimateRender(
+                self._attr_current_temperature,
+                self._attr_target_temperature,
+                self._attr_current_humidity,
+                self._attr_hvac_mode,
+                self._attr_hvac_action,
+                self._attr_preset_mode,
+            )
 
-        if round_half:
-            return round(2 * converted_temperature) / 2
+        channel = zone.channels[0]
+        table = self._controller.get_channel_table()
+        if channel.demand == 0 or self._attr_hvac_mode == HVACMode.OFF:
+            hvac_action = HVACAction.IDLE
+        elif self._attr_hvac_mode == HVACMode.HEAT:
+            hvac_action = HVACAction.HEATING
         else:
-            return round(converted_temperature, 1)
+            hvac_action = HVACAction.COOLING
+
+        render = ClimateRender(
+            table.current_temperatures[channel.id],
+            table.target_temperatures[channel.id],
+            channel.humidity if channel.humidity > 0 else None,
+            PRESET_CLIMATE_MODES_MAPPING[channel.operating_mode],
+            hvac_action,
+            PRESET_ENERGY_LEVELS_MAPPING_REVERSE[channel.energy_level],
+        )
+        _LOGGER.debug("Rendered zone %s with name %s and ID %s: %s", self._zone_number, self._name, self._id, render)
+        return render
 
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        _LOGGER.debug(f"Getting current temperature for zone {self._zone_number} with name {self._name} and ID {self._id}")
-        zone = self._controller.get_zone(self._id)
-        if zone is not None:
-            channel = zone.channels[0]
-            _LOGGER.debug(f"Current temperature {self.format_temperature(channel.current_temperature)} for zone {self._zone_number} with name {self._name} and ID {self._id}")
-            return self.format_temperature(channel.current_temperature)
-
-        return self._attr_current_temperature
+        return self._render.current_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the target temperature."""
-        _LOGGER.debug(f"Getting target temperature for zone {self._zone_number} with name {self._name} and ID {self._id}")
-        zone = self._controller.get_zone(self._id)
-        if zone is not None:
-            channel = zone.channels[0]
-            if channel.target_temperature is not None: 
-                return self.format_temperature(channel.target_temperature, True) if channel.target_temperature>0 else self.format_temperature(channel.current_temperature, True)
-            else:
-                return None
-
-        return self._attr_target_temperature
+        return self._render.target_temperature
 
     @property
     def current_humidity(self) -> float | None:
         """Return current humidity."""
-        _LOGGER.debug(f"Getting current humidity for zone {self._zone_number} with name {self._name} and ID {self._id}")
-        zone = self._controller.get_zone(self._id)
-        if zone is not None:
-            channel = zone.channels[0]
-            _LOGGER.debug(f"Current humidity {channel.humidity} for zone {self._zone_number} with name {self._name} and ID {self._id}")
-            return channel.humidity if channel.humidity>0 else None
-
-        return self._attr_current_humidity
+        return self._render.current_humidity
 
     @property
     def hvac_mode(self) -> str | None:
         """Return the current operation mode."""
-        _LOGGER.debug(f"Getting operation mode for zone {self._zone_number} with name {self._name} and ID {self._id}")
-        zone = self._controller.get_zone(self._id)
-        if zone is not None:
-            channel = zone.channels[0]
-            return PRESET_CLIMATE_MODES_MAPPING[channel.operating_mode]
-
-        return self._attr_hvac_mode
-    
+        return self._render.hvac_mode
+
     @property
     def hvac_action(self) -> str | None:
         """Hvac action."""
-        _LOGGER.debug(f"Getting HVAC action for zone {self._zone_number} with name {self._name} and ID {self._id}")
-        zone = self._controller.get_zone(self._id)
-        if zone is not None:
-            channel = zone.channels[0]
-            if channel.demand == 0:
-                return HVACAction.IDLE
-            else:
-                if self._attr_hvac_mode == HVACMode.OFF:
-                    return HVACAction.IDLE
-                elif self._attr_hvac_mode == HVACMode.AUTO:
-                    return HVACAction.COOLING
-                elif self._attr_hvac_mode == HVACMode.HEAT:
-                    return HVACAction.HEATING
-                elif self._attr_hvac_mode == HVACMode.COOL:
-                    return HVACAction.COOLING
-        return self._attr_hvac_action
+        return self._render.hvac_action
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current energy level."""
-        _LOGGER.debug(f"Getting energy level for zone {self._zone_number} with name {self._name} and ID {self._id}")
-        zone = self._controller.get_zone(self._id)
-        if zone is not None:
-            channel = zone.channels[0]
-            return PRESET_ENERGY_LEVELS_MAPPING_REVERSE[channel.energy_level]
-
-        return self._attr_preset_mode
+        return self._render.preset_mode
 
     async def async_set_preset_mode(self, preset_mode: str):
         """Set the preset mode of the climate entity."""
         mode = PRESET_ENERGY_LEVELS_MAPPING[preset_mode]
-        _LOGGER.debug(f"Setting mode to {mode} for zone {self._zone_number} with name {self._name} and ID {self._id}")
+        _LOGGER.debug("Setting mode to %s for zone %s with name %s and ID %s", mode, self._zone_number, self._name, self._id)
         self._controller.set_energy_level({"zone": self._id, "mode": mode})
 
     async def async_set_temperature(self, **kwargs):
@@ -251,13 +260,13 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
-        _LOGGER.debug(f"Setting temperature to {temperature} for zone {self._zone_number} with name {self._name} and ID {self._id}")
+        _LOGGER.debug("Setting temperature to %s for zone %s with name %s and ID %s", temperature, self._zone_number, self._name, self._id)
         self._controller.set_temperature({"zone": self._id, "temperature": temperature})
 
     async def async_set_hvac_mode(self, hvac_mode: str):
         """Set the HVAC mode of the climate entity."""
         operation_mode = PRESET_CLIMATE_MODES_MAPPING_REVERSE[hvac_mode]
-        _LOGGER.debug(f"Setting operation mode to {operation_mode} for zone {self._zone_number} with name {self._name} and ID {self._id}")
+        _LOGGER.debug("Setting operation mode to %s for zone %s with name %s and ID %s", operation_mode, self._zone_number, self._name, self._id)
         self._controller.set_operation_mode(operation_mode)
 
     def get_zone(self, zone_id: int) -> Zone:
@@ -14,6 +14,7 @@ from .rehau_mqtt_client import (
 )
 
 from .const import DOMAIN, LOGGER
+from .login_cache import cache_login
 
 
 class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -29,7 +30,7 @@ class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             try:
-                await self._test_credentials(
+                token_data, user = await self._test_credentials(
                     email=user_input[CONF_EMAIL],
                     password=user_input[CONF_PASSWORD],
                 )
@@ -43,6 +44,8 @@ class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
+                # The setup of the entry starts with this login instead of a new one.
+                cache_login(self.hass, user_input[CONF_EMAIL], token_data, user)
                 return self.async_create_entry(
                     title="REHAU Nea Smart 2.0 API",
                     data=user_input,
@@ -73,11 +76,11 @@ class RehauNeaSmart2FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_credentials(self, email: str, password: str) -> None:
-        """Validate credentials."""
+    async def _test_credentials(self, email: str, password: str) -> tuple[dict, dict]:
+        """Validate credentials and return the token data and user data of the login."""
         try:
             LOGGER.debug("Testing credentials")
-            await MqttClient.check_credentials(email=email, password=password)
+            return await MqttClient.login_with_credentials(email=email, password=password)
         except Exception as exception:
             LOGGER.exception(exception)
             raise MqttClientAuthenticationError from exception
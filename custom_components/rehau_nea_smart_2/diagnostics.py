@@ -0,0 +1,15 @@
+"""Diagnostics support for rehau_nea_smart_2."""
+
+from __future__ import annotations
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .rehau_mqtt_client.Controller import Controller
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return the diagnostics of a config entry."""
+    controller: Controller = hass.data[DOMAIN][entry.entry_id]
+    return controller.get_diagnostics()
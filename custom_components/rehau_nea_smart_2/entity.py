@@ -0,0 +1,45 @@
+"""Shared entity helpers for rehau_nea_smart_2."""
+
+from __future__ import annotations
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StateFingerprintMixin:
+    """Skip state writes that would not change what Home Assistant shows.
+
+    Entities fingerprint their rendered state as a tuple. A state change
+    whose fingerprint matches the last written one is dropped, which saves
+    the property reads and the state_changed event of async_write_ha_state.
+    Put it before the Home Assistant entity class in the bases.
+
+    Attributes:
+        suppressed_writes (int): The number of writes skipped by this entity.
+    """
+
+    _state_fingerprint = None
+    suppressed_writes = 0
+
+    def state_fingerprint(self) -> tuple:
+        """Return the rendered values of the entity state.
+
+        Entities whose attributes change independently of the state override it.
+
+        Returns:
+            tuple: The values Home Assistant shows for the entity.
+        """
+        return (self.available, self.state)
+
+    def _handle_state_changes(self, changes) -> None:
+        """Write the state after a change, unless its rendered values are unchanged."""
+        fingerprint = self.state_fingerprint()
+        if fingerprint == self._state_fingerprint:
+            self.suppressed_writes += 1
+            _LOGGER.debug(
+                "Skipped unchanged state write for %s, %s skipped so far", self.entity_id, self.suppressed_writes
+            )
+            return
+
+        self._state_fingerprint = fingerprint
+        self.async_write_ha_state()
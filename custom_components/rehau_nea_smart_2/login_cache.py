@@ -0,0 +1,32 @@
+"""Hand over of the config flow login to the first setup of the entry."""
+from __future__ import annotations
+
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+LOGIN_CACHE = f"{DOMAIN}_logins"
+# The setup follows the flow right away, an older login is not reused.
+LOGIN_CACHE_TTL = 300
+
+
+def cache_login(hass: HomeAssistant, email: str, token_data: dict, user: dict) -> None:
+    """Keep the login of a config flow for the setup of its entry."""
+    hass.data.setdefault(LOGIN_CACHE, {})[email] = (time.monotonic() + LOGIN_CACHE_TTL, token_data, user)
+
+
+def pop_login(hass: HomeAssistant, email: str) -> tuple[dict, dict] | None:
+    """Take the cached login of an email, if it has not expired.
+
+    Returns:
+        tuple: The token data and the user data, or None.
+    """
+    cached = hass.data.get(LOGIN_CACHE, {}).pop(email, None)
+    if cached is None:
+        return None
+    expires, token_data, user = cached
+    if expires < time.monotonic():
+        return None
+    return token_data, user
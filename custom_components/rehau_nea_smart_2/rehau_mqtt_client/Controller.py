@@ -1,22 +1,32 @@
 """Controller module for the REHAU NEA SMART 2 integration."""
+import asyncio
+import logging
 from collections.abc import Callable
-from .utils import replace_keys, EnergyLevels, OperationModes, ClientTopics
+from .utils import EnergyLevels, OperationModes, ClientTopics, ChannelTable
 from .handlers import update_temperature, update_energy_level, update_operating_mode
-from .models import Installation, Zone, LiveEmu
+from .models import Installation, InstallationState, ZoneState, LiveEmu, StateChange
 from .MqttClient import MqttClient
+from .coordinator import UpdateCoordinator
 from .exceptions import MqttClientError
 from homeassistant.core import HomeAssistant
 
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between the attempts of a background connection, doubled up to the maximum.
+CONNECT_RETRY_DELAY = 30
+MAX_CONNECT_RETRY_DELAY = 300
 
 class Controller:
     """Controller class for the REHAU NEA SMART 2 integration."""
 
-    def __init__(self, hass: HomeAssistant, email: str, password: str):
+    def __init__(self, hass: HomeAssistant, email: str, password: str, store=None, initial_login: tuple = None):
         """Initializ the Controller object.
 
         Args:
             email (str): The email address for authentication.
             password (str): The password for authentication.
+            store (Store): The Home Assistant store persisting the login, or None.
+            initial_login (tuple): The token data and user data of a recent login to start with, or None.
         """
         self.id = "REHAU NEA SMART 2.0"
         self.name = "REHAU NEA SMART 2.0 Climate Control System"
@@ -24,26 +34,110 @@ class Controller:
         self.manufacturer = "Rehau"
         self.auth_username = email
         self.auth_password = password
+        self.store = store
+        self.initial_login = initial_login
         self.mqtt_client = None
+        self.coordinator = None
         self.hass = hass
+        self.snapshot = None
+        self.snapshot_version = None
+        self.online = False
+        self.seeded = False
+        self.connect_task = None
+
+    def create_client(self):
+        """Create the MQTT client and its coordinator, once."""
+        if self.mqtt_client is not None:
+            return
+        self.mqtt_client = MqttClient(hass=self.hass, username=self.auth_username, password=self.auth_password, store=self.store, initial_login=self.initial_login)
+        self.initial_login = None
+        self.coordinator = UpdateCoordinator(self.mqtt_client)
+
+    async def load_snapshot(self) -> bool:
+        """Load the installations of the last session, without connecting.
+
+        The entities can be created from them while the connection is made
+        in the background, they stay unavailable until it is up.
+
+        Returns:
+            bool: True if loaded, False if the installations are only known after connecting.
+        """
+        self.create_client()
+        # A login handed over by the config flow is as fast as the snapshot.
+        if self.mqtt_client.initial_login is not None:
+            return False
+        self.seeded = await self.mqtt_client.seed_from_store()
+        return self.seeded
 
     async def connect(self):
-        """Connect to the MQTT broker and authenticates the user."""
-        self.mqtt_client = MqttClient(hass=self.hass, username=self.auth_username, password=self.auth_password)
+        """Connect to the MQTT broker and authenticates the user.
+
+        The entities only go online once the states of a stored snapshot
+        have been replaced by current user data.
+
+        Raises:
+            MqttClientError: If the states of the snapshot could not be replaced.
+        """
+        self.create_client()
         await self.mqtt_client.auth_user()
+        # Every login loads the user data, this covers a login that did not.
+        if self.mqtt_client.user_from_snapshot and not await self.mqtt_client.read_user_http():
+            raise MqttClientError("Could not load the current user data")
+        self.coordinator.start()
+        if self.seeded:
+            # The entities were created from the snapshot before the broker
+            # was subscribed to, a poll catches what changed meanwhile.
+            self.coordinator.request_refresh()
+        self.set_online()
+
+    def start_connect(self):
+        """Connect in a background task, retrying until it succeeds."""
+        self.connect_task = self.hass.async_create_background_task(
+            self.connect_with_retry(), "Rehau NEA Smart 2 Connect"
+        )
+
+    async def connect_with_retry(self):
+        """Connect, retrying with a growing delay while it fails."""
+        delay = CONNECT_RETRY_DELAY
+        while True:
+            try:
+                await self.connect()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _LOGGER.error("Could not connect, retrying in %s seconds: %s", delay, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_CONNECT_RETRY_DELAY)
+
+    def set_online(self):
+        """Mark the controller connected and let every entity update its availability."""
+        self.online = True
+        dispatcher = self.mqtt_client.dispatcher
+        dispatcher.queue()
+        dispatcher.flush()
 
     async def disconnect(self):
         """Disconnect from the MQTT broker."""
+        if self.connect_task is not None:
+            self.connect_task.cancel()
+            self.connect_task = None
+        self.online = False
+        self.coordinator.stop()
         self.mqtt_client.disconnect()
 
     def is_connected(self, installation_unique: str):
-        """Check if the installation is connected to the MQTT broker."""
-        Installations = self.get_installations_as_dict()
-        if Installations is None:
+        """Check if the installation is connected to the MQTT broker.
+
+        The installations loaded from the last session are not connected
+        until the controller is.
+        """
+        if not self.online:
+            return False
+        installation = self.mqtt_client.get_state_index().installations.get(installation_unique)
+        if installation is None:
             return False
-        for installation in Installations:
-            if installation["unique"] == installation_unique:
-                return installation["connected"]
+        return installation.connected
 
 
     def is_authenticated(self):
@@ -54,16 +148,23 @@ class Controller:
         """
         return self.mqtt_client.is_authenticated()
 
-    def get_installations(self) -> list[Installation]:
+    def get_installations(self) -> tuple[Installation, ...]:
         """Retrieve the list of installations.
 
+        The models are validated once per state version and the same snapshot
+        is returned until the next state change, so it must not be modified.
+
         Returns:
-            list[Installation]: The list of installations.
+            tuple[Installation, ...]: The list of installations.
         """
         installations = self.mqtt_client.get_installations()
         if installations is None:
             return None
-        return [Installation(**installation) for installation in installations]
+        version = self.mqtt_client.get_state_version()
+        if self.snapshot_version != version:
+            self.snapshot = tuple(installation.to_model() for installation in installations)
+            self.snapshot_version = version
+        return self.snapshot
 
     def get_live_emus(self) -> list[LiveEmu]:
         """Retrieve the list of installations.
@@ -76,13 +177,27 @@ class Controller:
             return None
         return [LiveEmu(**live_emu) for forlive_emu in live_emus]
 
+    def get_installation_states(self) -> list[InstallationState]:
+        """Retrieve the live installation states.
+
+        The states are shared with the MQTT client, changes made to them are
+        visible to every reader.
+
+        Returns:
+            list[InstallationState]: The list of installation states.
+        """
+        return self.mqtt_client.get_installations()
+
     def get_installations_as_dict(self) -> list[dict]:
         """Retrieve the list of installations as a dictionary.
 
         Returns:
             list[dict]: The list of installations as a dictionary.
         """
-        return self.mqtt_client.get_installations()
+        installations = self.mqtt_client.get_installations()
+        if installations is None:
+            return None
+        return [installation.to_dict() for installation in installations]
 
     def get_live_emus_as_dict(self) -> list[dict]:
         """Retrieve the list of installations as a dictionary.
@@ -100,35 +215,33 @@ class Controller:
         """
         return self.mqtt_client.get_live_didos()
 
-    def get_zones(self) -> list[Zone]:
+    def get_zones(self) -> list[ZoneState]:
         """Retrieve the list of zones.
 
         Returns:
-            list[Zone]: The list of zones.
+            list[ZoneState]: The list of zone states.
         """
         zones = []
-        for installation in self.get_installations():
-            for group in installation.groups:
-                for zone in group.zones:
-                    zones.append(zone)
+        for installation in self.get_installation_states():
+            zones.extend(installation.iter_zones())
         return zones
 
-    def get_zone(self, zone_id: int) -> Zone:
+    def get_zone(self, zone_id: int) -> ZoneState:
         """Retrieve a specific zone by zone id.
 
         Args:
             zone_id (int): The zone id.
 
         Returns:
-            Zone: The zone object.
+            ZoneState: The zone state.
 
         Raises:
             MqttClientError: If no zone is found for the given zone id.
         """
-        for zone in self.get_zones():
-            if zone.id == zone_id:
-                return zone
-        raise MqttClientError("No zone found for zone " + str(zone_id))
+        zone = self.mqtt_client.get_state_index().zones.get(zone_id)
+        if zone is None:
+            raise MqttClientError("No zone found for zone " + str(zone_id))
+        return zone
 
     def get_installation_unique_by_zone(self, zone_id: int) -> str:
         """Retrieve the unique installation identifier for a specific zone.
@@ -142,13 +255,10 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone id.
         """
-        installations = self.get_installations_as_dict()
-        for installation in installations:
-            for group in installation["groups"]:
-                for zone in group["zones"]:
-                    if zone["id"] == zone_id:
-                        return installation["unique"]
-        raise MqttClientError("No zone found for zone " + str(zone_id))
+        installation = self.mqtt_client.get_state_index().zone_installations.get(zone_id)
+        if installation is None:
+            raise MqttClientError("No zone found for zone " + str(zone_id))
+        return installation.unique
 
     def get_zone_value_by_key(self, key: str, zone_id: int):
         """Retrieve the value of a specific key for a specific zone.
@@ -163,31 +273,32 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone id or if no value is found for the key.
         """
-        installations = self.get_installations_as_dict()
-        for installation in installations:
-            for group in installation["groups"]:
-                for zone in group["zones"]:
-                    if zone["id"] == zone_id:
-                        if len(zone["channels"]) > 1 or key != "_id":
-                            values = []
-                            for channel in zone["channels"]:
-                                if key in channel:
-                                    values.append(channel[key])
-                            if len(values) == 0:
-                                raise MqttClientError(
-                                    "No value found for key "
-                                    + key
-                                    + " in zone "
-                                    + str(zone_id)
-                                )
-                            return sum(values) / len(values)
-                        else:
-                            raise MqttClientError(
-                                "Multiple channels found for zone "
-                                + str(zone_id)
-                                + " cannot return _id"
-                            )
-        raise MqttClientError("No zone found for zone " + str(zone_id))
+        table = self.mqtt_client.get_channel_table()
+        if table is not None:
+            value = table.get_zone_average(zone_id, key)
+            if value is not None:
+                return value
+
+        zone = self.get_zone(zone_id)
+        if len(zone.channels) > 1 or key != "_id":
+            values = []
+            for channel in zone.channels:
+                if hasattr(channel, key):
+                    values.append(getattr(channel, key))
+            if len(values) == 0:
+                raise MqttClientError(
+                    "No value found for key "
+                    + key
+                    + " in zone "
+                    + str(zone_id)
+                )
+            return sum(values) / len(values)
+        else:
+            raise MqttClientError(
+                "Multiple channels found for zone "
+                + str(zone_id)
+                + " cannot return _id"
+            )
 
     def get_temperature(self, zone_id: int, unit="C") -> float:
         """Retrieve the temperature for a specific zone.
@@ -202,6 +313,11 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone id.
         """
+        if unit == "C":
+            table = self.mqtt_client.get_channel_table()
+            if table is not None and zone_id in table.zone_temperatures:
+                return table.zone_temperatures[zone_id]
+
         temperature = self.get_zone_value_by_key("current_temperature", zone_id) / 10
         if unit == "C":
             temperature_celsius = (temperature - 32) / 1.8
@@ -223,6 +339,63 @@ class Controller:
         """
         return self.get_zone_value_by_key("humidity", zone_id)
 
+    def get_channel_table(self) -> ChannelTable:
+        """Retrieve the derived channel values of the current state.
+
+        Returns:
+            ChannelTable: The channel table, or None if no installations are loaded.
+        """
+        return self.mqtt_client.get_channel_table()
+
+    def get_current_temperature(self, zone_id: int) -> float:
+        """Retrieve the current temperature of the first channel of a zone, in Celsius.
+
+        Args:
+            zone_id (int): The zone id.
+
+        Returns:
+            float: The temperature rounded to one decimal.
+
+        Raises:
+            MqttClientError: If no zone is found for the given zone id.
+        """
+        channel = self.get_zone(zone_id).channels[0]
+        return self.mqtt_client.get_channel_table().current_temperatures[channel.id]
+
+    def get_target_temperature(self, zone_id: int) -> float:
+        """Retrieve the target temperature of the first channel of a zone, in Celsius.
+
+        A target of zero falls back to the current temperature.
+
+        Args:
+            zone_id (int): The zone id.
+
+        Returns:
+            float: The temperature rounded to half a degree, or None if the zone has no target.
+
+        Raises:
+            MqttClientError: If no zone is found for the given zone id.
+        """
+        channel = self.get_zone(zone_id).channels[0]
+        return self.mqtt_client.get_channel_table().target_temperatures[channel.id]
+
+    def notify_zone_changed(self, zone_id, field: str):
+        """Notify the subscribers of a zone of a value changed by a command, without waiting for the next flush.
+
+        Args:
+            zone_id: The zone id.
+            field (str): The changed channel attribute.
+        """
+        state_index = self.mqtt_client.get_state_index()
+        zone = state_index.zones.get(zone_id)
+        if zone is None:
+            self.mqtt_client.mark_state_changed(unconfirmed=True)
+            return
+
+        unique = state_index.zone_installations[zone_id].unique
+        changes = [StateChange(unique, zone_id, channel.id, field) for channel in zone.channels]
+        self.mqtt_client.queue_updates(changes, force=True)
+
     def set_temperature(self, payload: dict):
         """Set the temperature for a specific zone.
 
@@ -247,17 +420,15 @@ class Controller:
 
         int_temperature = int(temperature)
 
-        temperature_request = replace_keys(
-            {
-                "controller": payload["controller"] if "controller" in payload else 0,
-                "data": {"setpoint_used": int_temperature},
-                "type": "REQ_TH",
-                "zone": payload["zone"],
-            },
-            self.mqtt_client.get_referentials(),
+        temperature_request = self.mqtt_client.get_command_encoder().encode_zone_command(
+            payload["zone"],
+            "setpoint_used",
+            int_temperature,
+            controller=payload["controller"] if "controller" in payload else 0,
         )
 
-        update_temperature(self.get_installations_as_dict(), payload["zone"], int_temperature)
+        update_temperature(self.get_installation_states(), payload["zone"], int_temperature)
+        self.notify_zone_changed(payload["zone"], "target_temperature")
         return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, temperature_request)
 
     def get_energy_level(self, zone_id: int) -> EnergyLevels:
@@ -293,17 +464,15 @@ class Controller:
         if "zone" not in payload:
             raise MqttClientError("No zone found in payload")
 
-        energy_level_request = replace_keys(
-            {
-                "controller": payload["controller"] if "controller" in payload else 0,
-                "data": {"mode_permanent": payload["mode"]},
-                "type": "REQ_TH",
-                "zone": payload["zone"],
-            },
-            self.mqtt_client.get_referentials(),
+        energy_level_request = self.mqtt_client.get_command_encoder().encode_zone_command(
+            payload["zone"],
+            "mode_permanent",
+            payload["mode"],
+            controller=payload["controller"] if "controller" in payload else 0,
         )
 
-        update_energy_level(self.get_installations_as_dict(), payload["zone"], payload["mode"])
+        update_energy_level(self.get_installation_states(), payload["zone"], payload["mode"])
+        self.notify_zone_changed(payload["zone"], "energy_level")
         return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, energy_level_request)
 
     def get_global_energy_level(self) -> EnergyLevels:
@@ -315,8 +484,11 @@ class Controller:
         Raises:
             MqttClientError: If no installations are found.
         """
-        self.installations = self.get_installations_as_dict()
-        return self.installations[0]["global_energy_level"]
+        self.installations = self.get_installation_states()
+        table = self.mqtt_client.get_channel_table()
+        if table is not None:
+            return table.global_energy_levels[self.installations[0].unique]
+        return self.installations[0].global_energy_level
 
     def set_global_energy_level(self, payload: dict):
         """Set the global energy level.
@@ -334,22 +506,14 @@ class Controller:
             raise MqttClientError("No mode found in payload")
 
         zones = {}
-        for installation in self.get_installations_as_dict():
-            zones[installation["unique"]] = []
-            for group in installation["groups"]:
-                for zone in group["zones"]:
-                    zones[installation["unique"]].append(zone["number"])
+        for installation in self.get_installation_states():
+            zones[installation.unique] = [zone.number for zone in installation.iter_zones()]
 
         for _installation_unique, zones in zones.items():
-            global_energy_level_request = replace_keys(
-                {
-                    "controller": payload["controller"]
-                    if "controller" in payload
-                    else 0,
-                    "data": {"mode_used": payload["mode"], "zone_impacted": zones},
-                    "type": "REQ_TH",
-                },
-                self.mqtt_client.get_referentials(),
+            global_energy_level_request = self.mqtt_client.get_command_encoder().encode_global_energy_level(
+                payload["mode"],
+                zones,
+                controller=payload["controller"] if "controller" in payload else 0,
             )
 
             return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, global_energy_level_request)
@@ -363,8 +527,8 @@ class Controller:
         Raises:
             MqttClientError: If no installations are found.
         """
-        installation = self.get_installations_as_dict()[0]
-        return OperationModes(installation["operating_mode"])
+        installation = self.get_installation_states()[0]
+        return OperationModes(installation.operating_mode)
 
     def set_operation_mode(self, mode: str|int):
         """Set the operation mode.
@@ -384,18 +548,21 @@ class Controller:
         # mode to string with 0 padding
         mode = str(mode).zfill(2)
 
-        operation_mode_request = replace_keys(
-            {
-                "data": {"heat_cool": mode},
-                "type": "REQ_TH",
-            },
-            self.mqtt_client.get_referentials(),
-        )
+        operation_mode_request = self.mqtt_client.get_command_encoder().encode_operation_mode(mode)
 
 
-        update_operating_mode(self.get_installations_as_dict(), self.mqtt_client.get_install_id, mode)
+        update_operating_mode(self.get_installation_states(), self.mqtt_client.get_install_id, mode)
+        self.mqtt_client.mark_state_changed(unconfirmed=True)
         return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, operation_mode_request)
 
+    def get_diagnostics(self) -> dict:
+        """Retrieve the refresh cadence and polling counters.
+
+        Returns:
+            dict: The diagnostics of the update coordinator.
+        """
+        return self.coordinator.get_diagnostics()
+
     def is_ready(self) -> bool:
         """Check if the controller is connected to the MQTT broker.
 
@@ -420,104 +587,63 @@ class Controller:
         """
         self.mqtt_client.remove_callback(callback)
 
+    def subscribe(
+        self,
+        callback: Callable[[list[StateChange]], None],
+        installation_unique: str,
+        zone_id: str = None,
+        live: str = None,
+    ) -> Callable[[], None]:
+        """Subscribe to the changes of an installation, one of its zones or its live data.
+
+        Zone subscribers are only called for their zone and for installation
+        wide changes such as the connection state. Live subscribers are only
+        called for their live data.
+
+        Args:
+            callback (Callable[[list[StateChange]], None]): Called with the relevant changes, or None if unknown.
+            installation_unique (str): The installation unique.
+            zone_id (str): The zone id, to only receive the changes of this zone.
+            live (str): LIVE_EMU or LIVE_DIDO, to only receive the live data changes.
+
+        Returns:
+            Callable[[], None]: A function removing the subscription.
+        """
+        return self.coordinator.subscribe(callback, installation_unique, zone_id=zone_id, live=live)
+
     def get_installation_by_unique(self, installation_unique: str):
             """Return the installation."""
-            Installations = self.get_installations_as_dict()
-            if Installations is None:
+            if self.get_installation_states() is None:
                 return False
-            for installation in Installations:
-                if installation["unique"] == installation_unique:
-                    return installation
+            return self.mqtt_client.get_state_index().installations.get(installation_unique)
     
     def get_live_emu_by_unique(self, installation_unique: str):
             """Return the installation."""
             LiveEmus = self.get_live_emus_as_dict()
             if LiveEmus is None:
                 return {"unique": installation_unique, "pumpOn": None, "mixed_circuit1_setpoint": None, "mixed_circuit1_supply": None, "mixed_circuit1_return": None, "mixed_circuit1_opening": None }
-            for live_emu in LiveEmus:
-                if live_emu["unique"] == installation_unique:
-                    return live_emu
+            return self.mqtt_client.get_state_index().live_emus.get(installation_unique)
     
     def get_live_dido_by_unique(self, installation_unique: str):
             """Return the installation."""
             LiveDidos = self.get_live_didos_as_dict()
             if LiveDidos is None:
                 return {"unique": installation_unique, "DI_1": None, "DI_2": None, "DI_3": None, "DI_4": None, "DI_5": None, "DO_1": None, "DO_2": None, "DO_3": None, "DO_4": None, "DO_5": None }
-            for live_dido in LiveDidos:
-                if live_dido["unique"] == installation_unique:
-                    return live_dido
+            return self.mqtt_client.get_state_index().live_didos.get(installation_unique)
 
-    def get_zone(self, zone_id: int) -> Zone:
+    def get_zone(self, zone_id: int) -> ZoneState:
         """Retrieve a specific zone by zone id.
 
         Args:
             zone_id (int): The zone id.
 
         Returns:
-            Zone: The zone object.
+            ZoneState: The zone state.
 
         Raises:
             MqttClientError: If no zone is found for the given zone id.
         """
-        for zone in self.get_zones():
-            if zone.id == zone_id:
-                return zone
-        raise MqttClientError("No zone found for zone " + str(zone_id))
-
-def update_temperature(installations: list[Installation], zone_id: str, temperature: float) -> list[Installation]:
-    """Update temperature."""
-    for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["id"] == zone_id:
-                    for channel in zone["channels"]:
-                        channel["target_temperature"] = temperature
-
-    return installations
-
-def update_energy_level(installations: list[Installation], zone_id: str, energy_level: int) -> list[Installation]:
-    """Update energy level."""
-    for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["id"] == zone_id:
-                    for channel in zone["channels"]:
-                        channel["energy_level"] = energy_level
-
-    return installations
-
-def get_global_energy_level(installation) -> EnergyLevels:
-    """Calculate the global energy level based on the provided installation dictionary.
-
-    Args:
-        installation (dict): A dictionary representing the installation.
-
-    Returns:
-        EnergyLevels: The maximum EnergyLevels value representing the global energy level.
-    """
-    mode_count = {
-        EnergyLevels.PRESENT_MODE.value: 0,
-        EnergyLevels.ABSENT_MODE.value: 0,
-        EnergyLevels.STANDBY_MODE.value: 0,
-        EnergyLevels.TIMING_MODE.value: 0,
-        EnergyLevels.PARTY_MODE.value: 0,
-        EnergyLevels.HOLIDAY_MODE.value: 0,
-    }
-
-    for group in installation["groups"]:
-        for zone in group["zones"]:
-            for channel in zone["channels"]:
-                if channel["mode_permanent"] == EnergyLevels.PRESENT_MODE.value:
-                    mode_count[EnergyLevels.PRESENT_MODE.value] += 1
-                elif channel["mode_permanent"] == EnergyLevels.ABSENT_MODE.value:
-                    mode_count[EnergyLevels.ABSENT_MODE.value] += 1
-                elif channel["mode_permanent"] == EnergyLevels.STANDBY_MODE.value:
-                    mode_count[EnergyLevels.STANDBY_MODE.value] += 1
-                elif channel["mode_permanent"] == EnergyLevels.TIMING_MODE.value:
-                    mode_count[EnergyLevels.TIMING_MODE.value] += 1
-                elif channel["mode_permanent"] == EnergyLevels.PARTY_MODE.value:
-                    mode_count[EnergyLevels.PARTY_MODE.value] += 1
-                elif channel["mode_permanent"] == EnergyLevels.HOLIDAY_MODE.value:
-                    mode_count[EnergyLevels.HOLIDAY_MODE.value] += 1
-
-    return EnergyLevels(max(mode_count, key=mode_count.get))
+        zone = self.mqtt_client.get_state_index().zones.get(zone_id)
+        if zone is None:
+            raise MqttClientError("No zone found for zone " + str(zone_id))
+        return zone
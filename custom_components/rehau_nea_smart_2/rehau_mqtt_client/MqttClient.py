@@ -4,13 +4,15 @@ import json
 from collections.abc import Callable
 import paho.mqtt.client as mqtt
 import logging
-import schedule
-import aiocron
 import time
 import re
 
-from .utils import generate_uuid, ServerTopics, ClientTopics
-from .handlers import handle_message, auth, refresh, parse_installations, read_user_state
+from .utils import create_http_client, get_ssl_context, generate_uuid, sha256_hex, save_as_json, read_from_json, remove_json, ReferentialIndex, CommandEncoder, MessageDecoder, ChannelTable, ServerTopics, ClientTopics
+from .handlers import handle_message, auth, refresh, merge_installations, read_user_state
+from .models import StateIndex, StateChange, LIVE_EMU, LIVE_DIDO
+from .dispatcher import UpdateDispatcher, LIVE_FIELDS
+from .token_manager import TokenManager
+from .mqtt_transport import AsyncioMqttTransport
 from .exceptions import (
     MqttClientAuthenticationError,
     MqttClientCommunicationError,
@@ -25,27 +27,46 @@ class MqttClient:
     """MQTT client for the Rehau NEA Smart 2 integration."""
 
     MAX_CONNECT_RETRIES = 5
+    # Seconds to collect login data changes before they are written to the store.
+    LOGIN_SAVE_DELAY = 60
 
-    def __init__(self, hass: HomeAssistant, username, password):
+    def __init__(self, hass: HomeAssistant, username, password, update_window: float = 0, store=None, initial_login: tuple = None):
         """Initialize the MQTT client.
 
         Args:
             hass: The Home Assistant instance.
             username: The MQTT username.
             password: The MQTT password.
+            update_window: The seconds to coalesce updates before notifying, 0 for the next loop iteration.
+            store: The Home Assistant store persisting the token and user data, or None.
+            initial_login: The token data and user data of a recent login to start with, or None.
         """
         self.hass = hass
+        self.store = store
+        self.initial_login = initial_login
+        self.stored_login = None
         self.username = "app"
         self.password = "appuserplatform"
         self.auth_username = username
         self.auth_password = password
         self.token_data = None
+        self.token_manager = TokenManager(self)
+        self.mqtt_token = None
         self.user = None
         self.installations = None
+        self.state_version = 0
+        self.channel_table = None
+        self.channel_table_version = None
+        self.state_index = StateIndex()
         self.live_emus = None
         self.live_didos = None
         self.authenticated = False
         self.referentials = None
+        self.referentials_hash = None
+        self.referential_index = None
+        self.http_client = None
+        self.command_encoder = None
+        self.message_decoder = None
         self.transaction_id = None
         self.last_operating_mode = None
         self.current_installation = {
@@ -55,15 +76,19 @@ class MqttClient:
         }
         self.client_id = "app-" + generate_uuid()
         self.client = None
+        self.transport = None
         self.subscribe_topics = lambda: [
             {"topic": ClientTopics.LISTEN.value, "options": {}},
             {"topic": ClientTopics.LISTEN_TO_CONTROLLER.value, "options": {}},
         ]
-        self.stop_scheduler_loop = False
-        self.scheduler_task = None
         self.number_of_retries = 0
         self.number_of_message_failures = 0
-        self.callbacks = set()
+        self.user_state_hash = None
+        self.user_from_snapshot = False
+        self.number_of_applied_polls = 0
+        self.number_of_skipped_polls = 0
+        self.last_push_times = {}
+        self.dispatcher = UpdateDispatcher(update_window)
 
     @staticmethod
     async def check_credentials(email, password):
@@ -87,6 +112,22 @@ class MqttClient:
 
         raise MqttClientAuthenticationError("Invalid credentials")
 
+    @staticmethod
+    async def login_with_credentials(email, password):
+        """Log in with the provided credentials.
+
+        Args:
+            email: The user's email.
+            password: The user's password.
+
+        Returns:
+            tuple: The token data and the user data.
+
+        Raises:
+            MqttClientAuthenticationError: If the credentials are invalid.
+        """
+        return await auth(email, password)
+
     def is_authenticated(self):
         """Check if the MQTT client is authenticated.
 
@@ -113,7 +154,16 @@ class MqttClient:
             rc: The result code.
         """
         _LOGGER.debug("Connected with result code " + str(rc))
+        if rc in (mqtt.CONNACK_REFUSED_BAD_USERNAME_PASSWORD, mqtt.CONNACK_REFUSED_NOT_AUTHORIZED):
+            # The transport retries the connection with the credentials set by the refresh.
+            _LOGGER.info("Broker rejected the token. Refreshing...")
+            self.hass.async_create_task(self.token_manager.refresh(self.mqtt_token))
+            return
+        if rc != mqtt.CONNACK_ACCEPTED:
+            return
         self.authenticated = True
+        # Pushes missed while disconnected are not replayed, so the polls speed up again.
+        self.last_push_times = {}
         self.send_topics()
         self.request_server_referentials()
 
@@ -157,8 +207,12 @@ class MqttClient:
                 }
                 return
 
-    async def read_user_http(self):
-        """Read user data from the server periodically."""
+    async def read_user_http(self) -> bool:
+        """Read user data from the server periodically.
+
+        Returns:
+            bool: True if the user data was read, False if the poll failed.
+        """
         _LOGGER.debug("Read user")
         payload = {
             "username": self.auth_username,
@@ -168,14 +222,25 @@ class MqttClient:
             "demand": self.get_install_id(),
         }
         try:
-            user = await read_user_state(payload)
-            if user is not None:
-                await self.set_user(user)
+            user, user_state_hash = await read_user_state(payload, self.get_http_client(), self.user_state_hash)
+            if user is None:
+                self.number_of_skipped_polls += 1
+                _LOGGER.debug(
+                    "User state unchanged, %s polls skipped and %s applied",
+                    self.number_of_skipped_polls,
+                    self.number_of_applied_polls,
+                )
+                return True
+            self.number_of_applied_polls += 1
+            await self.set_user(user)
+            self.user_state_hash = user_state_hash
+            return True
         except MqttClientCommunicationError as e:
             _LOGGER.error("Error while refreshing user state: %s", e)
         except MqttClientAuthenticationError:
             _LOGGER.info("Token expired. Refreshing...")
-            await self.refresh_token()
+            await self.token_manager.refresh(payload["token"])
+        return False
 
     async def refresh_http(self):
         """Refresh the user data periodically."""
@@ -265,104 +330,295 @@ class MqttClient:
             self.number_of_message_failures = 0
         return mid
 
-    def start_mqtt_client(self):
-        """Start the MQTT client's event loop."""
-        self.client.loop_start()
-
     async def reconnect(self):
         """Reconnect to the MQTT broker."""
         await self.init_mqtt_client()
 
+    def get_http_client(self):
+        """Get the pooled HTTP client, created on first use.
+
+        Returns:
+            httpx.AsyncClient: The HTTP client.
+        """
+        if self.http_client is None:
+            self.http_client = create_http_client()
+        return self.http_client
+
+    async def close_http_client(self):
+        """Close the pooled HTTP client and its connections."""
+        http_client = self.http_client
+        self.http_client = None
+        if http_client is not None:
+            await http_client.aclose()
+
     def disconnect(self):
+        """Disconnect from the MQTT broker and close the HTTP connections."""
+        self.token_manager.cancel()
+        self.disconnect_mqtt_client()
+        if self.http_client is not None:
+            self.hass.async_create_task(self.close_http_client())
+
+    def disconnect_mqtt_client(self):
         """Disconnect from the MQTT broker."""
+        if self.client is None:
+            return
         for topic in self.subscribe_topics():
             topic_str = self.replace_wildcards(topic["topic"])
             _LOGGER.debug(f"Unsubscribing from topic: {topic_str}")
             self.client.unsubscribe(topic_str)
         self.client.disconnect()
-        self.client.loop_stop()
-        self.stop_scheduler()
+        self.transport.stop()
         _LOGGER.debug("Disconnected")
 
 
     def on_message_callback(self, client, userdata, message):
         """Handle the received message in a separate task.
 
+        The transport runs paho on the event loop, so the task is created
+        without a hop from another thread.
+
         Args:
             client: The MQTT client instance.
             userdata: The user data.
             msg: The received message.
         """
-        self.hass.create_task(self.on_message(client, userdata, message))
+        self.hass.async_create_task(self.on_message(client, userdata, message))
 
     async def init_mqtt_client(self):
         """Initialize the MQTT client."""
         _LOGGER.debug("Initializing MQTT client")
         if self.client:
-            self.disconnect()
+            self.disconnect_mqtt_client()
         self.client = mqtt.Client(client_id=self.client_id, transport="websockets")
-        self.client.username_pw_set(self.username + "?x-amz-customauthorizer-name=app-front",
-                                    self.token_data['access_token'])
+        self.set_mqtt_credentials()
         self.client.tls_set()
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message_callback
         self.client.on_disconnect = self.on_disconnect
         self.client.enable_logger(logger=_LOGGER)
-        self.client.reconnect_delay_set(min_delay=30, max_delay=300)
-        self.client.connect("mqtt.nea2aws.aws.rehau.cloud", 443)
-        self.start_scheduler()
-        self.start_mqtt_client()
+        self.transport = AsyncioMqttTransport(self.client, min_delay=30, max_delay=300)
+        await self.transport.connect("mqtt.nea2aws.aws.rehau.cloud", 443)
 
     async def auth_user(self):
         """Authenticate the user with the provided credentials."""
+        if self.referentials is None:
+            await self.load_cached_referentials()
+        # Loading the CA certificates blocks, so the shared context is built off the loop.
+        await self.hass.async_add_executor_job(get_ssl_context)
+        await self.login()
+        await self.init_mqtt_client()
+
+    async def login(self):
+        """Log in with the credentials and load the user data, keeping the MQTT connection.
+
+        A stored refresh token is tried first, as it takes a refresh and a
+        poll instead of the four requests of a full login. A login handed over by the
+        config flow is used as is.
+        """
+        if self.initial_login is not None:
+            token_data, user = self.initial_login
+            self.initial_login = None
+            self.set_token_data(token_data)
+            await self.set_user(user)
+            return
+        if await self.restore_login():
+            return
         token_data, user = await auth(self.auth_username, self.auth_password)
         self.set_token_data(token_data)
         await self.set_user(user)
-        await self.init_mqtt_client()
 
-    async def refresh_token(self):
-        """Refresh the authentication token."""
+    async def restore_login(self) -> bool:
+        """Restore the login from the stored refresh token and poll the current user data.
+
+        Returns:
+            bool: True if restored, False if a full login is needed.
+        """
+        if self.token_data is not None:
+            return False
+        data = await self.load_stored_login()
+        if data is None:
+            return False
 
-        _LOGGER.debug("Refreshing token")
         try:
-            token_data = await refresh(self.token_data["refresh_token"])
-            self.set_token_data(token_data)
-            await self.reconnect()
-        except MqttClientAuthenticationError as e:
-            _LOGGER.error("Could not refresh token: " + str(e))
-            await self.auth_user()
+            token_data = await refresh(data["token_data"]["refresh_token"])
+        except Exception as e:
+            _LOGGER.info("Could not restore the stored login, logging in: %s", e)
+            return False
+
+        # The stored user data can be days old, it only addresses the poll
+        # that loads the current one.
+        self.user = data["user"]
+        self.set_install_id()
+        self.set_token_data(token_data)
+        if not await self.read_user_http():
+            _LOGGER.info("Could not load the user data of the stored login, logging in")
+            return False
+        _LOGGER.debug("Restored the stored login")
+        return True
+
+    async def load_stored_login(self) -> dict:
+        """Load the stored token and user data of this account, once.
+
+        Returns:
+            dict: The login data, or None if nothing is stored for this account.
+        """
+        if self.stored_login is None and self.store is not None:
+            data = await self.store.async_load()
+            if data and data.get("username") == self.auth_username:
+                self.stored_login = data
+        return self.stored_login
+
+    async def seed_from_store(self) -> bool:
+        """Seed the installation states from the stored user data, before any login.
+
+        The states are those of the last session until the first poll
+        replaces them.
+
+        Returns:
+            bool: True if seeded, False if nothing usable is stored.
+        """
+        data = await self.load_stored_login()
+        if data is None or not data.get("user"):
+            return False
+        if self.referentials is None:
+            await self.load_cached_referentials()
+        await self.set_user(data["user"])
+        self.user_from_snapshot = True
+        return self.is_ready()
+
+    def get_login_data(self) -> dict:
+        """Get the token and user data persisted in the store.
+
+        Returns:
+            dict: The login data.
+        """
+        return {
+            "username": self.auth_username,
+            "token_data": self.token_data,
+            "user": self.user,
+        }
+
+    def save_login(self):
+        """Write the token and user data to the store after a short delay."""
+        if self.store is not None and self.token_data is not None and self.user is not None:
+            self.store.async_delay_save(self.get_login_data, self.LOGIN_SAVE_DELAY)
+
+    async def refresh_token(self):
+        """Refresh the authentication token, keeping the MQTT connection."""
+        await self.token_manager.refresh()
 
     async def set_installations(self, installations):
         """Set the installations.
 
         Args:
             installations: The installations.
+
+        Returns:
+            list[StateChange]: The changes applied to the state.
         """
         if len(installations) > 0 and "groups" in installations[0] and len(installations[0]["groups"]) > 0:
-            await self.update_installations(installations)
+            changes = await self.update_installations(installations)
             self.set_install_id()
+            return changes
+        return []
 
     async def update_installations(self, installations):
-        """Write the installations to a file."""
-        self.installations = parse_installations(installations, self.last_operating_mode)
-        await self.publish_updates()
+        """Merge the installations data into the current state.
+
+        Callbacks are only called when a value changed.
+
+        Args:
+            installations (list): The raw installations data.
+
+        Returns:
+            list[StateChange]: The changes applied to the state.
+        """
+        previous_installations = self.installations
+        self.installations, changes = merge_installations(
+            self.installations, installations, self.last_operating_mode
+        )
+        # Value changes are made in place, only a new layout needs a new index.
+        if previous_installations is None or any(change.field is None for change in changes):
+            self.state_index.index_installations(self.installations)
+        if changes:
+            await self.publish_updates(changes)
+        return changes
 
     def set_token_data(self, token_data):
         """Set the authentication token data and start the refresh timer.
 
+        The MQTT connection keeps the token it was opened with, the new one
+        is used when paho reconnects.
+
         Args:
             token_data: The token data.
         """
         self.token_data = token_data
+        self.set_mqtt_credentials()
+        self.token_manager.schedule(token_data)
+        self.save_login()
+
+    def set_mqtt_credentials(self):
+        """Set the current access token as the password of the next MQTT connection."""
+        if self.client is None:
+            return
+        self.mqtt_token = self.token_data["access_token"]
+        self.client.username_pw_set(self.username + "?x-amz-customauthorizer-name=app-front", self.mqtt_token)
 
     def get_installations(self):
         """Get the list of installations.
 
         Returns:
-            list: The list of installations.
+            list[InstallationState]: The live installation states.
         """
         return self.installations
 
+    def get_channel_table(self) -> ChannelTable:
+        """Get the derived channel values of the installations.
+
+        The table is built on first use after each state change.
+
+        Returns:
+            ChannelTable: The channel table, or None if there are no installations.
+        """
+        if self.installations is None:
+            return None
+        if self.channel_table_version != self.state_version:
+            self.channel_table = ChannelTable(self.installations)
+            self.channel_table_version = self.state_version
+        return self.channel_table
+
+    def get_state_version(self) -> int:
+        """Get the version of the installation and live states.
+
+        Returns:
+            int: A counter increased on every state change.
+        """
+        return self.state_version
+
+    def mark_state_changed(self, unconfirmed: bool = False):
+        """Record a change of the installation or live states.
+
+        Everything derived from the states is rebuilt on its next use. A
+        pushed change is also in the next polled body, so the hash of the
+        last one is kept. A change made by a command may not be applied by
+        the server, so the next poll is then ingested even if unchanged.
+
+        Args:
+            unconfirmed (bool): The change was made locally by a command.
+        """
+        self.state_version += 1
+        if unconfirmed:
+            self.user_state_hash = None
+
+    def get_state_index(self) -> StateIndex:
+        """Get the lookup tables over the installations and live records.
+
+        Returns:
+            StateIndex: The state index.
+        """
+        return self.state_index
+
     def get_live_emus(self):
         """Get the list of installations.
 
@@ -400,19 +656,24 @@ class MqttClient:
         return self.transaction_id
 
     async def set_user(self, user):
-        """Set the user data.
+        """Set the user data received from the server.
 
         Args:
             user: The user data.
         """
         self.user = user
+        self.user_from_snapshot = False
         if "installs" in user:
             if len(user["installs"]) > 0 and "user" in user["installs"][0] and "heatcool_auto_01" in user["installs"][0]["user"]:
                 self.last_operating_mode = user["installs"][0]["user"]["heatcool_auto_01"]
                 _LOGGER.debug("Setting last operating mode to " + str(self.last_operating_mode))
 
 
-            await self.set_installations(user["installs"])
+            changes = await self.set_installations(user["installs"])
+            # The store keeps the layout for the next start, the values of
+            # every poll are not worth a write.
+            if any(change.field is None for change in changes):
+                self.save_login()
 
     def get_install_id(self):
         """Get the installation ID.
@@ -441,10 +702,13 @@ class MqttClient:
     def get_install_ids(self):
         """Get the installation IDs.
 
+        They are read from the user data, which addresses the first poll
+        before the installation states exist.
+
         Returns:
             list: The installation IDs.
         """
-        return [install["id"] for install in self.get_installations()]
+        return [install["_id"] for install in self.user["installs"]]
 
     def get_referentials(self):
         """Get the referentials.
@@ -457,6 +721,103 @@ class MqttClient:
         else:
             raise MqttClientError("No referentials found")
 
+    def get_referential_index(self) -> ReferentialIndex:
+        """Get the lookup index built from the current referentials.
+
+        Returns:
+            ReferentialIndex: The referential index.
+        """
+        if self.referential_index is not None:
+            return self.referential_index
+        else:
+            raise MqttClientError("No referentials found")
+
+    def get_command_encoder(self) -> CommandEncoder:
+        """Get the command encoder compiled for the current referentials.
+
+        Returns:
+            CommandEncoder: The command encoder.
+        """
+        if self.command_encoder is not None:
+            return self.command_encoder
+        else:
+            raise MqttClientError("No referentials found")
+
+    def set_referential_index(self, referential_index: ReferentialIndex):
+        """Set the referential index and recompile the command encoder and message decoder.
+
+        Args:
+            referential_index: The referential index.
+        """
+        self.referential_index = referential_index
+        self.command_encoder = CommandEncoder(referential_index)
+        self.message_decoder = MessageDecoder(referential_index)
+
+    def get_referentials_file_name(self):
+        """Get the name of the file caching the referentials of this account.
+
+        Returns:
+            str: The file name.
+        """
+        return self.referentials_file_name(self.auth_username)
+
+    @staticmethod
+    def referentials_file_name(username):
+        """Get the name of the file caching the referentials of an account.
+
+        Args:
+            username: The account email.
+
+        Returns:
+            str: The file name.
+        """
+        return "referentials_" + sha256_hex(username)[:16] + ".json"
+
+    @staticmethod
+    async def remove_cached_referentials(hass: HomeAssistant, username):
+        """Remove the referentials cached for an account.
+
+        Args:
+            hass: The Home Assistant instance.
+            username: The account email.
+        """
+        await hass.async_add_executor_job(remove_json, MqttClient.referentials_file_name(username))
+
+    async def set_referentials(self, referentials, referentials_hash):
+        """Set the referentials and persist them for the next start.
+
+        Args:
+            referentials: The decoded referentials.
+            referentials_hash: The hash of the compressed referential payload.
+        """
+        self.referentials = referentials
+        self.referentials_hash = referentials_hash
+        self.set_referential_index(ReferentialIndex(referentials))
+        try:
+            await self.hass.async_add_executor_job(
+                save_as_json,
+                {"hash": referentials_hash, "referentials": referentials},
+                self.get_referentials_file_name(),
+            )
+        except OSError as e:
+            _LOGGER.warning("Could not cache referentials: %s", e)
+
+    async def load_cached_referentials(self):
+        """Load the referentials persisted by a previous run, if any."""
+        try:
+            cached = await self.hass.async_add_executor_job(read_from_json, self.get_referentials_file_name())
+        except (OSError, ValueError) as e:
+            _LOGGER.warning("Could not read cached referentials: %s", e)
+            return
+
+        if len(cached) == 0 or not isinstance(cached[0], dict) or "referentials" not in cached[0]:
+            return
+
+        self.referentials = cached[0]["referentials"]
+        self.referentials_hash = cached[0].get("hash")
+        self.set_referential_index(ReferentialIndex(self.referentials))
+        _LOGGER.debug("Loaded cached referentials")
+
     def request_server_referentials(self):
         """Request the referentials from the server."""
 
@@ -473,19 +834,13 @@ class MqttClient:
         install_id = payload["install_id"]
 
         if self.live_emus is None:
-            self.live_emus = [{"unique": install_id }]
-
-        live_emu = next(
-            (
-                live_emu
-                for live_emu in self.live_emus
-                if live_emu["unique"] == install_id
-            ),
-            None,
-        )
+            self.live_emus = []
+
+        live_emu = self.state_index.live_emus.get(install_id)
         if live_emu is None:
             live_emu = {"unique": install_id }
             self.live_emus.append(live_emu)
+            self.state_index.live_emus[install_id] = live_emu
 
         live_emu["pumpOn"] = payload["pumpOn"]
         live_emu["mixed_circuit1_setpoint"] = payload["mixed_circuit1_setpoint"]
@@ -493,25 +848,19 @@ class MqttClient:
         live_emu["mixed_circuit1_return"] = payload["mixed_circuit1_return"]
         live_emu["mixed_circuit1_opening"] = payload["mixed_circuit1_opening"]
 
-        await self.publish_updates()
+        await self.publish_updates([StateChange(install_id, None, None, LIVE_EMU)])
 
     async def update_live_dido(self, payload: dict):        
         install_id = payload["install_id"]
 
         if self.live_didos is None:
-            self.live_didos = [{"unique": install_id }]
-
-        live_dido = next(
-            (
-                live_dido
-                for live_dido in self.live_didos
-                if live_dido["unique"] == install_id
-            ),
-            None,
-        )
+            self.live_didos = []
+
+        live_dido = self.state_index.live_didos.get(install_id)
         if live_dido is None:
             live_dido = {"unique": install_id }
             self.live_didos.append(live_dido)
+            self.state_index.live_didos[install_id] = live_dido
 
         live_dido["DI_1"] = payload["DI_1"]
         live_dido["DI_2"] = payload["DI_2"]
@@ -525,7 +874,7 @@ class MqttClient:
         live_dido["DO_5"] = payload["DO_5"]
         
 
-        await self.publish_updates()
+        await self.publish_updates([StateChange(install_id, None, None, LIVE_DIDO)])
 
     async def update_channel(self, payload: dict):
         """Update the channel with the provided payload.
@@ -541,34 +890,50 @@ class MqttClient:
         mode_used = payload["mode_used"]
         setpoint_used = payload["setpoint_used"] if payload["setpoint_used"]>0 else None
 
-        installation = next(
-            (
-                installation
-                for installation in self.installations
-                if installation["unique"] == install_id
-            ),
-            None,
-        )
-        if installation is None:
+        if install_id not in self.state_index.installations:
             raise MqttClientError("No installation found for id " + install_id)
+        self.last_push_times[install_id] = time.monotonic()
 
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                for channel in zone["channels"]:
-                    if channel["id"] == channel_id:
-                        channel["energy_level"] = mode_used
-                        channel["target_temperature"] = setpoint_used
-                        await self.publish_updates()
-                        return
+        location = self.state_index.channels.get(channel_id)
+        if location is not None and location.installation.unique == install_id:
+            location.channel.energy_level = mode_used
+            location.channel.target_temperature = setpoint_used
+            zone_id = location.zone.id
+            await self.publish_updates([
+                StateChange(install_id, zone_id, channel_id, "energy_level"),
+                StateChange(install_id, zone_id, channel_id, "target_temperature"),
+            ])
+            return
 
 
         raise MqttClientError("No channel found for id " + channel_id)
 
 
-    async def publish_updates(self) -> None:
-        """Publish updates to all registered callbacks."""
-        for callback in self.callbacks:
-            callback()
+    async def publish_updates(self, changes: list[StateChange] = None, force: bool = False) -> None:
+        """Publish updates to the registered callbacks and the subscribers of the changes.
+
+        Args:
+            changes (list[StateChange]): The changes, or None if unknown.
+            force (bool): Notify right away instead of on the next coalesced flush.
+        """
+        self.queue_updates(changes, force)
+
+    def queue_updates(self, changes: list[StateChange] = None, force: bool = False) -> None:
+        """Queue updates for the registered callbacks and the subscribers of the changes.
+
+        The updates of a burst are coalesced into one notification, which is
+        sent on the next event loop iteration or after the update window.
+
+        Args:
+            changes (list[StateChange]): The changes, or None if unknown.
+            force (bool): Notify right away, for changes made by user commands.
+        """
+        # Live data is not part of the installation states.
+        if changes is None or any(change.field not in LIVE_FIELDS for change in changes):
+            self.mark_state_changed(unconfirmed=force)
+        self.dispatcher.queue(changes)
+        if force:
+            self.dispatcher.flush()
 
 
     def register_callback(self, callback: Callable[[], None]) -> None:
@@ -577,7 +942,7 @@ class MqttClient:
         Args:
             callback (Callable[[], None]): Callback to be called when Roller changes state.
         """
-        self.callbacks.add(callback)
+        self.dispatcher.add_listener(callback)
 
     def remove_callback(self, callback: Callable[[], None]) -> None:
         """Remove previously registered callback.
@@ -585,41 +950,24 @@ class MqttClient:
         Args:
             callback (Callable[[], None]): Callback to be removed.
         """
-        self.callbacks.discard(callback)
-
-    def run_scheduler(self):
-        """Run the scheduler in a separate thread."""
-        while not self.stop_scheduler_loop:
-            schedule.run_pending()
-            time.sleep(1)
-
-    async def start_scheduler_task(self):
-        """Start the scheduler in a separate thread."""
-        _LOGGER.debug("Starting scheduler thread")
-        aiocron.crontab("*/1 * * * *", func=self.refresh_http, start=True)
-        aiocron.crontab("*/1 * * * *", func=self.refresh_live_data, start=True)
-        aiocron.crontab("*/5 * * * *", func=self.request_server_referentials, start=True)
-        if "access_token" in self.token_data:
-            _LOGGER.debug("Scheduling token refresh")
-            expires_in = self.token_data["expires_in"] - 300
-            _LOGGER.debug("Token expires in " + str(expires_in) + " seconds")
-            # aiocron.crontab(f"*/{expires_in} * * * *", func=self.refresh_token, start=True)
-        else:
-            _LOGGER.error("No access token found")
-
-        while not self.stop_scheduler_loop:
-            await asyncio.sleep(1)
+        self.dispatcher.remove_listener(callback)
 
-    def start_scheduler(self):
-        """Start the scheduler to run periodic tasks."""
-        self.scheduler_task = asyncio.create_task(self.start_scheduler_task(), name="Rehau NEA Smart 2 Scheduler")
-
-    def stop_scheduler(self):
-        """Stop the scheduler."""
-        _LOGGER.debug("Stopping scheduler")
-        self.stop_scheduler_loop = True
-        if self.scheduler_task:
-            self.scheduler_task.cancel()
-            self.scheduler_task = None
+    def subscribe(
+        self,
+        callback: Callable[[list[StateChange]], None],
+        installation_unique: str,
+        zone_id: str = None,
+        live: str = None,
+    ) -> Callable[[], None]:
+        """Subscribe to the changes of an installation, one of its zones or its live data.
 
+        Args:
+            callback (Callable[[list[StateChange]], None]): Called with the relevant changes.
+            installation_unique (str): The installation unique.
+            zone_id (str): The zone id, to only receive the changes of this zone.
+            live (str): LIVE_EMU or LIVE_DIDO, to only receive the live data changes.
 
+        Returns:
+            Callable[[], None]: A function removing the subscription.
+        """
+        return self.dispatcher.subscribe(callback, installation_unique, zone_id=zone_id, live=live)
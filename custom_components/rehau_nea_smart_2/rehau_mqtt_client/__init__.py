@@ -3,6 +3,7 @@
 import logging
 from .Controller import Controller
 from .MqttClient import MqttClient
+from .coordinator import UpdateCoordinator, HTTP_REFRESH, LIVE_REFRESH, REFERENTIALS_REFRESH
 from .models import (
     Cooling,
     Heating,
@@ -11,9 +12,11 @@ from .models import (
     Zone,
     Group,
     Installation,
-    LiveEmu
+    LiveEmu,
+    LIVE_EMU,
+    LIVE_DIDO,
 )
-from .utils import EnergyLevels, OperationModes
+from .utils import EnergyLevels, OperationModes, fahrenheit_tenths_to_celsius
 from .exceptions import (
     MqttClientError,
     MqttClientAuthenticationError,
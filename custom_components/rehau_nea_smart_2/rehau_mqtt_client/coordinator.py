@@ -0,0 +1,255 @@
+"""Coordinator between the MQTT client and the entities."""
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from .models import StateChange
+
+_LOGGER = logging.getLogger(__name__)
+
+ChangeListener = Callable[[Optional[list[StateChange]]], None]
+
+HTTP_REFRESH = "http"
+LIVE_REFRESH = "live"
+REFERENTIALS_REFRESH = "referentials"
+
+DEFAULT_REFRESH_INTERVALS = {
+    HTTP_REFRESH: 60,
+    LIVE_REFRESH: 60,
+    REFERENTIALS_REFRESH: 300,
+}
+
+# While the realtime feed pushes channel updates the HTTP poll only backs it up.
+DEFAULT_PUSH_HTTP_INTERVAL = 600
+# The feed counts as quiet when an installation had no push for this long.
+DEFAULT_PUSH_TIMEOUT = 180
+
+
+class UpdateCoordinator:
+    """Own the refresh schedule and the change notifications of an account.
+
+    The HTTP polls and the MQTT pushes are both merged into the installation
+    states of the MQTT client, which reports the changes they made. The
+    coordinator runs the polls from a single task and hands the changes to
+    the listeners, so the refresh intervals and the notification window of
+    all platforms are tuned here.
+
+    The HTTP poll adapts to the realtime feed: while every installation
+    received a push within the push timeout it runs at the slower push
+    interval. It drops back to its normal interval when the feed goes quiet,
+    which includes a reconnect to the broker, as the push times are cleared.
+    """
+
+    def __init__(
+        self,
+        mqtt_client,
+        refresh_intervals: dict = None,
+        update_window: float = None,
+        push_http_interval: float = DEFAULT_PUSH_HTTP_INTERVAL,
+        push_timeout: float = DEFAULT_PUSH_TIMEOUT,
+    ):
+        """Initialize the coordinator.
+
+        Args:
+            mqtt_client (MqttClient): The MQTT client holding the state.
+            refresh_intervals (dict): The seconds between refreshes, keyed by HTTP_REFRESH, LIVE_REFRESH or REFERENTIALS_REFRESH.
+            update_window (float): The seconds to coalesce changes before notifying, the client default if None.
+            push_http_interval (float): The seconds between HTTP polls while the realtime feed is active.
+            push_timeout (float): The seconds without a push after which the feed of an installation is quiet.
+        """
+        self.mqtt_client = mqtt_client
+        self.refresh_intervals = {**DEFAULT_REFRESH_INTERVALS, **(refresh_intervals or {})}
+        self.push_http_interval = push_http_interval
+        self.push_timeout = push_timeout
+        self.refreshes = {
+            HTTP_REFRESH: mqtt_client.refresh_http,
+            LIVE_REFRESH: mqtt_client.refresh_live_data,
+            REFERENTIALS_REFRESH: mqtt_client.request_server_referentials,
+        }
+        self.last_refresh = {}
+        self.refresh_task = None
+        self.wakeup = asyncio.Event()
+        if update_window is not None:
+            mqtt_client.dispatcher.window = update_window
+
+    def start(self):
+        """Start the refresh task.
+
+        Every refresh is due after one interval, as connecting already
+        loads the user data and requests the referentials.
+        """
+        if self.refresh_task is not None:
+            return
+        self.last_refresh = dict.fromkeys(self.refreshes, time.monotonic())
+        self.refresh_task = self.mqtt_client.hass.async_create_background_task(
+            self.run(), "Rehau NEA Smart 2 Coordinator"
+        )
+
+    def stop(self):
+        """Stop the refresh task."""
+        _LOGGER.debug("Stopping coordinator")
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            self.refresh_task = None
+
+    def get_push_feed_expiry(self) -> Optional[float]:
+        """Get when the realtime feed goes quiet, if it is active now.
+
+        Returns:
+            float or None: The monotonic time the first installation runs out of pushes, or None if the feed is not active.
+        """
+        uniques = self.mqtt_client.get_state_index().installations.keys()
+        if not uniques:
+            return None
+        last_pushes = self.mqtt_client.last_push_times
+        if any(unique not in last_pushes for unique in uniques):
+            return None
+        expiry = min(last_pushes[unique] for unique in uniques) + self.push_timeout
+        if expiry <= time.monotonic():
+            return None
+        return expiry
+
+    def is_push_feed_active(self) -> bool:
+        """Check if every installation received a push within the push timeout."""
+        return self.get_push_feed_expiry() is not None
+
+    def get_refresh_interval(self, name: str) -> float:
+        """Get the current interval of a refresh, adapted to the realtime feed for the HTTP poll.
+
+        Args:
+            name (str): The refresh name.
+
+        Returns:
+            float: The seconds between refreshes.
+        """
+        if name == HTTP_REFRESH and self.is_push_feed_active():
+            return self.push_http_interval
+        return self.refresh_intervals[name]
+
+    async def run(self):
+        """Run the refreshes as they become due."""
+        while True:
+            now = time.monotonic()
+            due = {name: self.last_refresh[name] + self.get_refresh_interval(name) for name in self.refreshes}
+            name = min(due, key=due.get)
+            if due[name] > now:
+                wake = due[name]
+                # The HTTP poll speeds up again when the feed goes quiet.
+                expiry = self.get_push_feed_expiry()
+                if expiry is not None:
+                    wake = min(wake, expiry)
+                self.wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), wake - now)
+                # The schedule may have changed while waiting.
+                continue
+
+            self.last_refresh[name] = now
+            await self.run_refresh(name)
+
+    async def run_refresh(self, name: str):
+        """Run a refresh, errors are logged so that the schedule keeps going.
+
+        Args:
+            name (str): The refresh name.
+        """
+        _LOGGER.debug("Running %s refresh", name)
+        try:
+            result = self.refreshes[name]()
+            if isinstance(result, Awaitable):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _LOGGER.error("Error during %s refresh: %s", name, e)
+
+    def set_refresh_interval(self, name: str, interval: float):
+        """Change the interval of a refresh, counted from its last run.
+
+        Args:
+            name (str): The refresh name.
+            interval (float): The seconds between refreshes.
+        """
+        self.refresh_intervals[name] = interval
+        self.wakeup.set()
+
+    def request_refresh(self, name: str = HTTP_REFRESH):
+        """Run a refresh as soon as possible.
+
+        Args:
+            name (str): The refresh name.
+        """
+        if self.refresh_task is not None:
+            self.last_refresh[name] = float("-inf")
+            self.wakeup.set()
+
+    def get_diagnostics(self) -> dict:
+        """Get the refresh cadence and the realtime feed state.
+
+        Returns:
+            dict: The diagnostics.
+        """
+        now = time.monotonic()
+        return {
+            "push_feed_active": self.is_push_feed_active(),
+            "refresh_intervals": {name: self.get_refresh_interval(name) for name in self.refreshes},
+            "configured_refresh_intervals": dict(self.refresh_intervals),
+            "push_http_interval": self.push_http_interval,
+            "push_timeout": self.push_timeout,
+            "seconds_since_push": {
+                unique: round(now - last_push, 1) for unique, last_push in self.mqtt_client.last_push_times.items()
+            },
+            "applied_polls": self.mqtt_client.number_of_applied_polls,
+            "skipped_polls": self.mqtt_client.number_of_skipped_polls,
+        }
+
+    def get_installations(self) -> list:
+        """Get the installation states.
+
+        Returns:
+            list[InstallationState]: The installation states.
+        """
+        return self.mqtt_client.get_installations()
+
+    def get_state_version(self) -> int:
+        """Get the version of the installation states.
+
+        Returns:
+            int: The state version.
+        """
+        return self.mqtt_client.get_state_version()
+
+    def add_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Add a listener called on every update.
+
+        Args:
+            callback (Callable[[], None]): The callback.
+
+        Returns:
+            Callable[[], None]: A function removing the listener.
+        """
+        self.mqtt_client.register_callback(callback)
+        return lambda: self.mqtt_client.remove_callback(callback)
+
+    def subscribe(
+        self,
+        callback: ChangeListener,
+        installation_unique: str,
+        zone_id: str = None,
+        live: str = None,
+    ) -> Callable[[], None]:
+        """Subscribe to the changes of an installation, one of its zones or its live data.
+
+        Args:
+            callback (ChangeListener): Called with the relevant changes, or None if unknown.
+            installation_unique (str): The installation unique.
+            zone_id (str): The zone id, to only receive the changes of this zone.
+            live (str): LIVE_EMU or LIVE_DIDO, to only receive the live data changes.
+
+        Returns:
+            Callable[[], None]: A function removing the subscription.
+        """
+        return self.mqtt_client.subscribe(callback, installation_unique, zone_id=zone_id, live=live)
@@ -0,0 +1,173 @@
+"""Dispatch of state changes to the subscribed entities."""
+import asyncio
+import logging
+from collections.abc import Callable
+from .models import StateChange, LIVE_EMU, LIVE_DIDO
+
+_LOGGER = logging.getLogger(__name__)
+
+LIVE_FIELDS = (LIVE_EMU, LIVE_DIDO)
+
+# Installation level fields every entity of the installation depends on,
+# None stands for an installation added, removed or rebuilt.
+INSTALLATION_WIDE_FIELDS = (None, "connected", "operating_mode", "group_name")
+
+# Zone level fields the installation level aggregates are computed from.
+AGGREGATED_FIELDS = ("energy_level", "operating_mode")
+
+
+class UpdateDispatcher:
+    """Route state changes to the callbacks subscribed to what changed.
+
+    Subscriptions are keyed by installation, by zone or by live data kind.
+    A change of one zone only wakes the subscribers of that zone and, when
+    it affects the installation aggregates, the installation subscribers.
+    Each callback is called once per dispatch with the changes relevant to it.
+
+    Queued changes are coalesced and flushed once per event loop iteration,
+    or once per window when one is set, so a burst of updates costs a single
+    notification per affected subscriber.
+    """
+
+    def __init__(self, window: float = 0):
+        """Initialize the dispatcher without subscriptions.
+
+        Args:
+            window (float): The seconds to collect changes before a flush, 0 flushes on the next loop iteration.
+        """
+        self.listeners = set()
+        self.subscribers = {}
+        self.installation_keys = {}
+        self.window = window
+        self.pending = {}
+        self.pending_unknown = False
+        self.flush_handle = None
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Add a listener called on every update, whatever changed.
+
+        Args:
+            callback (Callable[[], None]): The listener.
+        """
+        self.listeners.add(callback)
+
+    def remove_listener(self, callback: Callable[[], None]):
+        """Remove a listener.
+
+        Args:
+            callback (Callable[[], None]): The listener.
+        """
+        self.listeners.discard(callback)
+
+    def subscribe(
+        self,
+        callback: Callable[[list[StateChange]], None],
+        installation_unique: str,
+        zone_id: str = None,
+        live: str = None,
+    ) -> Callable[[], None]:
+        """Subscribe to the changes of an installation, one of its zones or its live data.
+
+        Args:
+            callback (Callable[[list[StateChange]], None]): Called with the relevant changes.
+            installation_unique (str): The installation unique.
+            zone_id (str): The zone id, to only receive the changes of this zone.
+            live (str): LIVE_EMU or LIVE_DIDO, to only receive the live data changes.
+
+        Returns:
+            Callable[[], None]: A function removing the subscription.
+        """
+        if live is not None:
+            key = (installation_unique, None, live)
+        else:
+            key = (installation_unique, zone_id, None)
+        self.subscribers.setdefault(key, set()).add(callback)
+        self.installation_keys.setdefault(installation_unique, set()).add(key)
+
+        def unsubscribe():
+            callbacks = self.subscribers.get(key)
+            if callbacks is None:
+                return
+            callbacks.discard(callback)
+            if not callbacks:
+                del self.subscribers[key]
+                self.installation_keys[installation_unique].discard(key)
+
+        return unsubscribe
+
+    def get_keys(self, change: StateChange):
+        """Return the subscription keys a change is relevant to."""
+        unique = change.installation
+        if change.field in LIVE_FIELDS:
+            return ((unique, None, change.field),)
+        if change.zone is not None:
+            if change.field in AGGREGATED_FIELDS:
+                return ((unique, change.zone, None), (unique, None, None))
+            return ((unique, change.zone, None),)
+        if change.field in INSTALLATION_WIDE_FIELDS:
+            return tuple(self.installation_keys.get(unique, ()))
+        return ((unique, None, None),)
+
+    def queue(self, changes: list[StateChange] = None):
+        """Queue changes for the next flush.
+
+        Args:
+            changes (list[StateChange]): The changes, or None to wake every subscriber.
+        """
+        if changes is None:
+            self.pending_unknown = True
+        else:
+            # A dict keeps the order and drops the changes repeated in a burst.
+            self.pending.update(dict.fromkeys(changes))
+
+        if self.flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            if self.window > 0:
+                self.flush_handle = loop.call_later(self.window, self.flush)
+            else:
+                self.flush_handle = loop.call_soon(self.flush)
+
+    def flush(self):
+        """Dispatch the queued changes now."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.pending and not self.pending_unknown:
+            return
+
+        changes = None if self.pending_unknown else list(self.pending)
+        self.pending = {}
+        self.pending_unknown = False
+        self.dispatch(changes)
+
+    def dispatch(self, changes: list[StateChange] = None):
+        """Call the listeners and the subscribers affected by the changes.
+
+        A callback that raises is logged, the others are still called.
+
+        Args:
+            changes (list[StateChange]): The changes, or None to wake every subscriber.
+        """
+        for listener in list(self.listeners):
+            try:
+                listener()
+            except Exception:
+                _LOGGER.exception("Error in update listener %s", listener)
+
+        if changes is None:
+            targets = {callback: None for callbacks in self.subscribers.values() for callback in callbacks}
+        else:
+            targets = {}
+            for change in changes:
+                for key in self.get_keys(change):
+                    for callback in self.subscribers.get(key, ()):
+                        targets.setdefault(callback, []).append(change)
+        for callback, callback_changes in targets.items():
+            try:
+                callback(callback_changes)
+            except Exception:
+                _LOGGER.exception("Error in update subscriber %s", callback)
@@ -1,7 +1,7 @@
 """The Rehau Nea Smart 2 MQTT handlers."""
 
 from .auth import auth, refresh
-from .installation import parse_installations, update_temperature, update_energy_level, update_operating_mode
+from .installation import parse_installations, merge_installations, update_temperature, update_energy_level, update_operating_mode
 from .message import handle_message
 from .user import read_user_state
 
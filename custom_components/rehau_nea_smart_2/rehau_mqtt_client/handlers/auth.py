@@ -1,14 +1,13 @@
 """Auth handler for Rehau NEA Smart 2."""
 import logging
 import secrets
-import httpx
 from urllib.parse import urlparse, parse_qs
 
 from ..exceptions import (
     MqttClientAuthenticationError,
     MqttClientCommunicationError,
 )
-from ..utils import generate_auth_url
+from ..utils import generate_auth_url, create_http_client
 from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,7 +19,16 @@ AUTH_URL_ORIGIN = "https://accounts.rehau.com"
 
 
 async def auth(email, password, check_credentials=False):
-    """Authenticate with Rehau NEA Smart 2."""
+    """Authenticate with Rehau NEA Smart 2.
+
+    The login runs on a short lived client, so that no session cookie of
+    an earlier login changes the authorize redirect.
+
+    Args:
+        email: The account email.
+        password: The account password.
+        check_credentials: Only check the credentials and return a bool.
+    """
     challenge = secrets.token_urlsafe(16)
     url = await generate_auth_url(
         CLIENT_ID,
@@ -29,7 +37,7 @@ async def auth(email, password, check_credentials=False):
         AUTH_URL_ORIGIN,
         challenge
     )
-    async with httpx.AsyncClient() as client:
+    async with create_http_client() as client:
         _LOGGER.debug("Getting login site")
         login_site = await client.get(url, timeout=30)
         parsed_url = urlparse(login_site.headers["Location"])
@@ -100,9 +108,15 @@ async def auth(email, password, check_credentials=False):
         return token_data, user["data"]["user"]
 
 async def refresh(refresh_token):
-    """Handle the refresh of the authentication token."""
+    """Handle the refresh of the authentication token.
+
+    Like the login, it runs on a short lived client with its own cookies.
+
+    Args:
+        refresh_token: The refresh token.
+    """
 
-    async with httpx.AsyncClient() as client:
+    async with create_http_client() as client:
         token_response = await client.post(AUTH_URL_ORIGIN + "/token-srv/token", timeout=30, data={
             "client_id": CLIENT_ID,
             "refresh_token": refresh_token,
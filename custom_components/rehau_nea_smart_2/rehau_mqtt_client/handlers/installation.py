@@ -1,7 +1,18 @@
 """Handlers for installation data."""
-from ..models import Installation
-from ..utils import parse_operating_mode, get_global_energy_level, save_as_json
+from ..models import InstallationState, GroupState, ZoneState, ChannelState, StateChange
+from ..utils import parse_operating_mode, ENERGY_LEVEL_ORDER, save_as_json
 import datetime
+import functools
+import operator
+
+@functools.lru_cache(maxsize=32)
+def parse_connection_date(last_connection: str) -> datetime.datetime:
+    """Parse a lastConnection timestamp.
+
+    The timestamp only changes when the installation reconnects, so the
+    parsed values are cached instead of calling strptime on every poll.
+    """
+    return datetime.datetime.strptime(last_connection, '%Y-%m-%dT%H:%M:%S.%fZ')
 
 def is_installation_connected(installation) -> bool:
     """Check if installation is connected."""
@@ -9,105 +20,246 @@ def is_installation_connected(installation) -> bool:
         last_connection = installation['lastConnection']
         connection_state = installation['connectionState']
 
-        last_connection_date = datetime.datetime.strptime(last_connection, '%Y-%m-%dT%H:%M:%S.%fZ')
+        last_connection_date = parse_connection_date(last_connection)
 
         return connection_state and last_connection_date is not None
 
     return False
 
-def parse_installations(installations, last_operation_mode) -> list[Installation]:
+def get_installation_operating_mode(installation, last_operation_mode) -> int:
+    """Parse the operating mode of installation data, once per installation."""
+    return parse_operating_mode(
+        installation["user"]["heatcool_auto_01"] if "user" in installation else last_operation_mode
+    )
+
+def parse_channel(channel, operating_mode) -> ChannelState:
+    """Parse channel data."""
+    return ChannelState(
+        channel["_id"],
+        channel.get("humidity",0),
+        channel["demand"],
+        channel["setpoint_used"],
+        channel["temp_zone"],
+        channel["mode_permanent"],
+        operating_mode,
+        channel["setpoint_c_normal"],
+        channel["setpoint_c_reduced"],
+        channel["setpoint_h_normal"],
+        channel["setpoint_h_reduced"],
+        channel["setpoint_h_standby"],
+    )
+
+# The ChannelState attributes compared when merging, in parse_channel order.
+CHANNEL_ATTRIBUTES = (
+    "humidity",
+    "demand",
+    "target_temperature",
+    "current_temperature",
+    "energy_level",
+    "operating_mode",
+    "setpoint_cooling_normal",
+    "setpoint_cooling_reduced",
+    "setpoint_heating_normal",
+    "setpoint_heating_reduced",
+    "setpoint_heating_standby",
+)
+get_channel_values = operator.attrgetter(*CHANNEL_ATTRIBUTES)
+
+def merge_channel(current: ChannelState, channel, operating_mode) -> list[str]:
+    """Copy the changed values of channel data onto a channel state and return the changed attribute names."""
+    values = (
+        channel.get("humidity",0),
+        channel["demand"],
+        channel["setpoint_used"],
+        channel["temp_zone"],
+        channel["mode_permanent"],
+        operating_mode,
+        channel["setpoint_c_normal"],
+        channel["setpoint_c_reduced"],
+        channel["setpoint_h_normal"],
+        channel["setpoint_h_reduced"],
+        channel["setpoint_h_standby"],
+    )
+    # Most channels are unchanged between polls, one tuple comparison settles them.
+    if values == get_channel_values(current):
+        return []
+
+    changed = []
+    for name, value in zip(CHANNEL_ATTRIBUTES, values):
+        if getattr(current, name) != value:
+            setattr(current, name, value)
+            changed.append(name)
+    return changed
+
+def parse_installation_values(installation, operating_mode, global_energy_level) -> dict:
+    """Parse the installation level values of installation data, keyed by InstallationState attribute.
+
+    The aggregates computed over the channels are passed in by the caller,
+    which collects them while walking the channels.
+    """
+    return {
+        "id": installation["_id"],
+        "connected": is_installation_connected(installation),
+        "unique": installation["unique"],
+        "outside_temp": installation["outside_temp"],
+        "outsideTempFiltered": installation["outsideTempFiltered"],
+        "hash": installation["hash"] if "hash" in installation else None,
+        "global_energy_level": global_energy_level,
+        "operating_mode": operating_mode,
+    }
+
+def parse_installation(installation, last_operation_mode) -> InstallationState:
+    """Parse installation data.
+
+    The groups, zones and channels are built in a single pass which also
+    counts the energy levels for the global energy level.
+    """
+    operating_mode = get_installation_operating_mode(installation, last_operation_mode)
+    votes = dict.fromkeys(ENERGY_LEVEL_ORDER, 0)
+    groups = []
+    for group in installation["groups"]:
+        zones = []
+        for zone in group["zones"]:
+            channels = []
+            for channel in zone["channels"]:
+                channel_state = parse_channel(channel, operating_mode)
+                if channel_state.energy_level in votes:
+                    votes[channel_state.energy_level] += 1
+                channels.append(channel_state)
+            zones.append(ZoneState(zone["_id"], zone["name"], zone["number"], channels))
+        groups.append(GroupState(group["_id"], group["name"], zones))
+
+    values = parse_installation_values(installation, operating_mode, max(votes, key=votes.get))
+    return InstallationState(groups=groups, **values)
+
+def parse_installations(installations, last_operation_mode) -> list[InstallationState]:
     """Parse installations data."""
+    return [parse_installation(installation, last_operation_mode) for installation in installations]
+
+def merge_values(current, values: dict) -> list[str]:
+    """Copy the changed values onto a state object and return the changed attribute names."""
+    changed = []
+    for name, value in values.items():
+        if getattr(current, name) != value:
+            setattr(current, name, value)
+            changed.append(name)
+    return changed
+
+def merge_installation(current: InstallationState, installation, last_operation_mode):
+    """Merge installation data into an installation state, in place.
+
+    The layout check, the value comparison and the energy level count share
+    a single pass over the channels.
+
+    Args:
+        current (InstallationState): The installation state.
+        installation (dict): The raw installation data.
+        last_operation_mode (dict): The operating mode used when the installation has no user data.
+
+    Returns:
+        list[StateChange] or None: The changes, or None if the groups, zones or channels differ.
+    """
+    unique = current.unique
+    if len(current.groups) != len(installation["groups"]):
+        return None
+
+    operating_mode = get_installation_operating_mode(installation, last_operation_mode)
+    votes = dict.fromkeys(ENERGY_LEVEL_ORDER, 0)
+    changes = []
+    for current_group, group in zip(current.groups, installation["groups"]):
+        if current_group.id != group["_id"] or len(current_group.zones) != len(group["zones"]):
+            return None
+        if current_group.group_name != group["name"]:
+            current_group.group_name = group["name"]
+            # Groups have no subscription key, the rename reaches the whole installation.
+            changes.append(StateChange(unique, None, None, "group_name"))
+        for current_zone, zone in zip(current_group.zones, group["zones"]):
+            if current_zone.id != zone["_id"] or len(current_zone.channels) != len(zone["channels"]):
+                return None
+            if current_zone.name != zone["name"] or current_zone.number != zone["number"]:
+                for field in merge_values(current_zone, {"name": zone["name"], "number": zone["number"]}):
+                    changes.append(StateChange(unique, current_zone.id, None, field))
+            for current_channel, channel in zip(current_zone.channels, zone["channels"]):
+                if current_channel.id != channel["_id"]:
+                    return None
+                for field in merge_channel(current_channel, channel, operating_mode):
+                    changes.append(StateChange(unique, current_zone.id, current_channel.id, field))
+                if current_channel.energy_level in votes:
+                    votes[current_channel.energy_level] += 1
+
+    values = parse_installation_values(installation, operating_mode, max(votes, key=votes.get))
+    for field in merge_values(current, values):
+        changes.append(StateChange(unique, None, None, field))
+    return changes
+
+def merge_installations(current_installations, installations, last_operation_mode) -> tuple[list[InstallationState], list[StateChange]]:
+    """Merge installations data into the installation states, in place.
+
+    Only the values that differ from the current state are written. An
+    installation whose groups, zones or channels changed is parsed again as
+    a whole and reported with a single installation level change.
+
+    Args:
+        current_installations (list[InstallationState]): The installation states, or None.
+        installations (list): The raw installations data.
+        last_operation_mode (dict): The operating mode used when an installation has no user data.
+
+    Returns:
+        tuple: The installation states and the list of changes.
+    """
+    if current_installations is None:
+        parsed = parse_installations(installations, last_operation_mode)
+        return parsed, [StateChange(installation.unique, None, None, None) for installation in parsed]
+
+    current_by_unique = {installation.unique: installation for installation in current_installations}
+    merged = []
+    changes = []
+    for installation in installations:
+        unique = installation["unique"]
+        current = current_by_unique.get(unique)
+        installation_changes = None
+        if current is not None:
+            installation_changes = merge_installation(current, installation, last_operation_mode)
+        if installation_changes is None:
+            # A partially merged state is dropped for the rebuilt one.
+            merged.append(parse_installation(installation, last_operation_mode))
+            changes.append(StateChange(unique, None, None, None))
+            continue
+
+        changes.extend(installation_changes)
+        merged.append(current)
+
+    removed = current_by_unique.keys() - {installation.unique for installation in merged}
+    changes.extend(StateChange(unique, None, None, None) for unique in removed)
+
+    return merged, changes
 
-    installations_data = [
-        {
-            "id": installation["_id"],
-            "connected": is_installation_connected(installation),
-            "unique": installation["unique"],
-            "outside_temp": installation["outside_temp"],
-            "outsideTempFiltered": installation["outsideTempFiltered"],
-            "hash": installation["hash"] if "hash" in installation else None,
-            "global_energy_level": get_global_energy_level(installation).value,
-            "operating_mode": parse_operating_mode(
-                installation["user"]["heatcool_auto_01"] if "user" in installation else last_operation_mode
-            ),
-            "groups": [
-                {
-                    "id": group["_id"],
-                    "group_name": group["name"],
-                    "zones": [
-                        {
-                            "id": zone["_id"],
-                            "name": zone["name"],
-                            "number": zone["number"],
-                            "channels": [
-                                {
-                                    "id": channel["_id"],
-                                    "humidity": channel.get("humidity",0),
-                                    "demand": channel["demand"],
-                                    "target_temperature": channel["setpoint_used"],
-                                    "current_temperature": channel["temp_zone"],
-                                    "energy_level": channel["mode_permanent"],
-                                    "operating_mode": parse_operating_mode(
-                                        installation["user"]["heatcool_auto_01"] if "user" in installation else last_operation_mode
-                                    ),
-                                    "setpoints": {
-                                        "cooling": {
-                                            "normal": channel["setpoint_c_normal"],
-                                            "reduced": channel["setpoint_c_reduced"],
-                                        },
-                                        "heating": {
-                                            "normal": channel["setpoint_h_normal"],
-                                            "reduced": channel["setpoint_h_reduced"],
-                                            "standby": channel["setpoint_h_standby"],
-                                        },
-                                        "min": 644,
-                                        "max": 806,
-                                    },
-                                }
-                                for channel in zone["channels"]
-                            ],
-                        }
-                        for zone in group["zones"]
-                    ],
-                }
-                for group in installation["groups"]
-            ],
-        }
-        for installation in installations
-    ]
-
-    return installations_data
-
-
-def update_temperature(installations: list[Installation], zone_id: str, temperature: float) -> list[Installation]:
+def update_temperature(installations: list[InstallationState], zone_id: str, temperature: float) -> list[InstallationState]:
     """Update temperature."""
     for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["id"] == zone_id:
-                    for channel in zone["channels"]:
-                        channel["target_temperature"] = temperature
+        for zone in installation.iter_zones():
+            if zone.id == zone_id:
+                for channel in zone.channels:
+                    channel.target_temperature = temperature
 
     return installations
 
-def update_energy_level(installations: list[Installation], zone_id: str, energy_level: int) -> list[Installation]:
+def update_energy_level(installations: list[InstallationState], zone_id: str, energy_level: int) -> list[InstallationState]:
     """Update energy level."""
     for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["id"] == zone_id:
-                    for channel in zone["channels"]:
-                        channel["energy_level"] = energy_level
+        for zone in installation.iter_zones():
+            if zone.id == zone_id:
+                for channel in zone.channels:
+                    channel.energy_level = energy_level
 
     return installations
 
-def update_operating_mode(installations: list[Installation], zone_id: str, operating_mode: str) -> list[Installation]:
+def update_operating_mode(installations: list[InstallationState], zone_id: str, operating_mode: str) -> list[InstallationState]:
     """Update operating mode."""
     for installation in installations:
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                if zone["id"] == zone_id:
-                    for channel in zone["channels"]:
-                        channel["operating_mode"] = operating_mode
+        for zone in installation.iter_zones():
+            if zone.id == zone_id:
+                for channel in zone.channels:
+                    channel.operating_mode = operating_mode
 
     return installations
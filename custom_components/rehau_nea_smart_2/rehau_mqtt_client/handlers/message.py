@@ -2,7 +2,7 @@
 import json
 import logging
 
-from ..utils import decompress_utf16
+from ..utils import decompress_utf16, sha256_hex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +29,8 @@ async def handle_app_message(payload: str, client):
 async def handle_user_message(payload: str, client):
     """Handle user message."""
     message = json.loads(payload)
+    if client.message_decoder is not None:
+        message = client.message_decoder.decode(message)
     _LOGGER.debug("Handling user message: " + message["type"])
     if message["type"] == "read_user":
         await handle_user_read(message, client)
@@ -70,8 +72,13 @@ async def handle_channel_update(message, client):
 
 async def handle_referential(message, client):
     """Handle referential."""
+    referentials_hash = sha256_hex(message["data"])
+    if referentials_hash == client.referentials_hash:
+        _LOGGER.debug("Referentials unchanged")
+        return
+
     referentials = decompress_utf16(message["data"])
-    client.referentials = referentials
+    await client.set_referentials(referentials, referentials_hash)
     _LOGGER.debug("Referentials updated")
 
 
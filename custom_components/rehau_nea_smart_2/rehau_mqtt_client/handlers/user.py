@@ -1,29 +1,44 @@
-"""Handlers for the refresh of the authentication token."""
+"""Handlers for the polls of the user data."""
+import hashlib
 import logging
 import httpx
 
 from ..exceptions import MqttClientCommunicationError, MqttClientAuthenticationError
+from ..utils import borrow_http_client
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# Marks a response hash taken from the ETag header instead of the body.
+ETAG_PREFIX = "etag:"
 
-async def read_user_state(payload: dict):
-    """Handle the refresh of the authentication token.
+
+async def read_user_state(payload: dict, http_client: httpx.AsyncClient = None, previous_hash: str = None):
+    """Poll the user data of the installations with getDataofInstall.
+
+    The poll is conditional. When the previous response had an ETag, it is
+    sent back in If-None-Match and a 304 means nothing changed. Otherwise
+    the response is identified by a hash of its body. An unchanged response
+    is not decoded.
 
     Args:
-        payload: The payload to send to the API.
+        payload: The user, installations and token of the poll.
+        http_client: The pooled HTTP client, a short lived one is used if None.
+        previous_hash: The hash of the previous response, or None to always decode it.
 
     Returns:
-        dict: The response from the refresh API call.
+        tuple: The user data, or None on a 304 or an unchanged body hash, and the hash of the response.
 
     Raises:
-        MqttClientCommunicationError: If there is an error while communicating with the MQTT client.
+        MqttClientAuthenticationError: If the token is rejected.
+        MqttClientCommunicationError: If the request fails.
     """
     url = f"https://api.nea2aws.aws.rehau.cloud/v1/users/{payload['username']}/getDataofInstall?demand={payload['demand']}&installsList={payload['installs_ids']}&hash={payload['install_hash']}"
     headers = {"Authorization": payload['token']}
+    if previous_hash is not None and previous_hash.startswith(ETAG_PREFIX):
+        headers["If-None-Match"] = previous_hash[len(ETAG_PREFIX):]
     try:
-        async with httpx.AsyncClient() as client:
+        async with borrow_http_client(http_client) as client:
             user_response = await client.get(url, headers=headers, timeout=60)
             if user_response.status_code >= 400:
                 if user_response.status_code == 401:
@@ -31,7 +46,18 @@ async def read_user_state(payload: dict):
                 else:
                     raise MqttClientCommunicationError("Could not read user data from the API. Status code: " + str(user_response.status_code) + " Reason: " + user_response.text)
 
+            if user_response.status_code == 304:
+                return None, previous_hash
+
+            etag = user_response.headers.get("ETag")
+            if etag:
+                response_hash = ETAG_PREFIX + etag
+            else:
+                response_hash = hashlib.sha256(user_response.content).hexdigest()
+            if response_hash == previous_hash:
+                return None, response_hash
+
             user = user_response.json()
-            return user["data"]["user"]
+            return user["data"]["user"], response_hash
     except httpx.RequestError as exception:
         raise MqttClientCommunicationError("Could not read user data from the API. Reason: " + str(exception)) from exception
@@ -10,6 +10,8 @@ from .installation import (
     Installation,
     LiveEmu
 )
+from .changes import StateChange, LIVE_EMU, LIVE_DIDO
+from .state import InstallationState, GroupState, ZoneState, ChannelState, ChannelLocation, StateIndex
 
 def __init__():
     """Initialize the Rehau Nea Smart 2 MQTT integration types."""
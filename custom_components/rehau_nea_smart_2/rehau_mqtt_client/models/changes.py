@@ -0,0 +1,19 @@
+"""Type definitions for state changes."""
+from typing import NamedTuple, Optional
+
+LIVE_EMU = "live_emu"
+LIVE_DIDO = "live_dido"
+
+
+class StateChange(NamedTuple):
+    """A change of the installation state.
+
+    The zone and channel are None for installation level changes. The field
+    is None when the installation was added, removed or rebuilt as a whole,
+    and LIVE_EMU or LIVE_DIDO when the live data of the installation changed.
+    """
+
+    installation: str
+    zone: Optional[str]
+    channel: Optional[str]
+    field: Optional[str]
@@ -0,0 +1,288 @@
+"""Compact state model for the installation data.
+
+The live state is kept in slotted classes instead of nested dictionaries.
+The setpoints are stored flat on the channel and the fixed setpoint limits
+are class attributes, so a channel is a single small object. The pydantic
+models of ``installation`` are only built on demand for export.
+"""
+from typing import NamedTuple, Optional
+from .installation import Cooling, Heating, Setpoints, Channel, Zone, Group, Installation
+
+SETPOINT_MIN = 644
+SETPOINT_MAX = 806
+
+
+class ChannelState:
+    """Live state of a channel."""
+
+    __slots__ = (
+        "id",
+        "humidity",
+        "demand",
+        "target_temperature",
+        "current_temperature",
+        "energy_level",
+        "operating_mode",
+        "setpoint_cooling_normal",
+        "setpoint_cooling_reduced",
+        "setpoint_heating_normal",
+        "setpoint_heating_reduced",
+        "setpoint_heating_standby",
+    )
+
+    setpoint_min = SETPOINT_MIN
+    setpoint_max = SETPOINT_MAX
+
+    def __init__(
+        self,
+        id: str,
+        humidity: int,
+        demand: int,
+        target_temperature: Optional[int],
+        current_temperature: int,
+        energy_level: int,
+        operating_mode: int,
+        setpoint_cooling_normal: int,
+        setpoint_cooling_reduced: int,
+        setpoint_heating_normal: int,
+        setpoint_heating_reduced: int,
+        setpoint_heating_standby: int,
+    ):
+        """Initialize the channel state."""
+        self.id = id
+        self.humidity = humidity
+        self.demand = demand
+        self.target_temperature = target_temperature
+        self.current_temperature = current_temperature
+        self.energy_level = energy_level
+        self.operating_mode = operating_mode
+        self.setpoint_cooling_normal = setpoint_cooling_normal
+        self.setpoint_cooling_reduced = setpoint_cooling_reduced
+        self.setpoint_heating_normal = setpoint_heating_normal
+        self.setpoint_heating_reduced = setpoint_heating_reduced
+        self.setpoint_heating_standby = setpoint_heating_standby
+
+    def to_dict(self) -> dict:
+        """Return the channel in the nested dictionary layout."""
+        return {
+            "id": self.id,
+            "humidity": self.humidity,
+            "demand": self.demand,
+            "target_temperature": self.target_temperature,
+            "current_temperature": self.current_temperature,
+            "energy_level": self.energy_level,
+            "operating_mode": self.operating_mode,
+            "setpoints": {
+                "cooling": {
+                    "normal": self.setpoint_cooling_normal,
+                    "reduced": self.setpoint_cooling_reduced,
+                },
+                "heating": {
+                    "normal": self.setpoint_heating_normal,
+                    "reduced": self.setpoint_heating_reduced,
+                    "standby": self.setpoint_heating_standby,
+                },
+                "min": self.setpoint_min,
+                "max": self.setpoint_max,
+            },
+        }
+
+    def to_model(self) -> Channel:
+        """Return the channel as a pydantic model."""
+        return Channel(
+            id=self.id,
+            humidity=self.humidity,
+            demand=self.demand,
+            target_temperature=self.target_temperature,
+            current_temperature=self.current_temperature,
+            energy_level=self.energy_level,
+            operating_mode=self.operating_mode,
+            setpoints=Setpoints(
+                cooling=Cooling(
+                    normal=self.setpoint_cooling_normal,
+                    reduced=self.setpoint_cooling_reduced,
+                ),
+                heating=Heating(
+                    normal=self.setpoint_heating_normal,
+                    reduced=self.setpoint_heating_reduced,
+                    standby=self.setpoint_heating_standby,
+                ),
+                min=self.setpoint_min,
+                max=self.setpoint_max,
+            ),
+        )
+
+
+class ZoneState:
+    """Live state of a zone."""
+
+    __slots__ = ("id", "name", "number", "channels")
+
+    def __init__(self, id: str, name: str, number: int, channels: list[ChannelState]):
+        """Initialize the zone state."""
+        self.id = id
+        self.name = name
+        self.number = number
+        self.channels = channels
+
+    def to_dict(self) -> dict:
+        """Return the zone in the nested dictionary layout."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "number": self.number,
+            "channels": [channel.to_dict() for channel in self.channels],
+        }
+
+    def to_model(self) -> Zone:
+        """Return the zone as a pydantic model."""
+        return Zone(
+            id=self.id,
+            name=self.name,
+            number=self.number,
+            channels=[channel.to_model() for channel in self.channels],
+        )
+
+
+class GroupState:
+    """Live state of a group."""
+
+    __slots__ = ("id", "group_name", "zones")
+
+    def __init__(self, id: str, group_name: str, zones: list[ZoneState]):
+        """Initialize the group state."""
+        self.id = id
+        self.group_name = group_name
+        self.zones = zones
+
+    def to_dict(self) -> dict:
+        """Return the group in the nested dictionary layout."""
+        return {
+            "id": self.id,
+            "group_name": self.group_name,
+            "zones": [zone.to_dict() for zone in self.zones],
+        }
+
+    def to_model(self) -> Group:
+        """Return the group as a pydantic model."""
+        return Group(
+            id=self.id,
+            group_name=self.group_name,
+            zones=[zone.to_model() for zone in self.zones],
+        )
+
+
+class InstallationState:
+    """Live state of an installation."""
+
+    __slots__ = (
+        "id",
+        "unique",
+        "connected",
+        "outside_temp",
+        "outsideTempFiltered",
+        "hash",
+        "global_energy_level",
+        "operating_mode",
+        "groups",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        unique: str,
+        connected: bool,
+        outside_temp: int,
+        outsideTempFiltered: int,
+        hash: Optional[str],
+        global_energy_level: int,
+        operating_mode: int,
+        groups: list[GroupState],
+    ):
+        """Initialize the installation state."""
+        self.id = id
+        self.unique = unique
+        self.connected = connected
+        self.outside_temp = outside_temp
+        self.outsideTempFiltered = outsideTempFiltered
+        self.hash = hash
+        self.global_energy_level = global_energy_level
+        self.operating_mode = operating_mode
+        self.groups = groups
+
+    def iter_zones(self):
+        """Iterate over the zones of all groups."""
+        for group in self.groups:
+            yield from group.zones
+
+    def to_dict(self) -> dict:
+        """Return the installation in the nested dictionary layout."""
+        return {
+            "id": self.id,
+            "connected": self.connected,
+            "unique": self.unique,
+            "outside_temp": self.outside_temp,
+            "outsideTempFiltered": self.outsideTempFiltered,
+            "hash": self.hash,
+            "global_energy_level": self.global_energy_level,
+            "operating_mode": self.operating_mode,
+            "groups": [group.to_dict() for group in self.groups],
+        }
+
+    def to_model(self) -> Installation:
+        """Return the installation as a pydantic model."""
+        return Installation(
+            id=self.id,
+            unique=self.unique,
+            global_energy_level=self.global_energy_level,
+            connected=self.connected,
+            operating_mode=self.operating_mode,
+            groups=[group.to_model() for group in self.groups],
+            outside_temp=self.outside_temp,
+            outsideTempFiltered=self.outsideTempFiltered,
+        )
+
+
+class ChannelLocation(NamedTuple):
+    """A channel state with the zone and installation it belongs to."""
+
+    channel: ChannelState
+    zone: ZoneState
+    installation: InstallationState
+
+
+class StateIndex:
+    """Lookup tables over the installation states and live records.
+
+    The tables point at the live objects, so value changes are visible
+    without maintenance. The installation tables are rebuilt when the
+    installations are replaced or their layout changes, and the live
+    record tables are kept up to date as records are added.
+    """
+
+    def __init__(self):
+        """Initialize empty lookup tables."""
+        self.installations = {}
+        self.zones = {}
+        self.zone_installations = {}
+        self.channels = {}
+        self.live_emus = {}
+        self.live_didos = {}
+
+    def index_installations(self, installations: list[InstallationState]):
+        """Rebuild the installation, zone and channel tables.
+
+        Args:
+            installations (list[InstallationState]): The installation states.
+        """
+        self.installations = {}
+        self.zones = {}
+        self.zone_installations = {}
+        self.channels = {}
+        for installation in installations:
+            self.installations[installation.unique] = installation
+            for zone in installation.iter_zones():
+                self.zones[zone.id] = zone
+                self.zone_installations[zone.id] = installation
+                for channel in zone.channels:
+                    self.channels[channel.id] = ChannelLocation(channel, zone, installation)
@@ -0,0 +1,206 @@
+"""Network loop of the paho MQTT client on the asyncio event loop."""
+import asyncio
+import logging
+import threading
+
+import paho.mqtt.client as mqtt
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between the keepalive checks of paho.
+MISC_INTERVAL = 1
+# Seconds before reopening a lost connection, doubled up to the maximum.
+RECONNECT_MIN_DELAY = 30
+RECONNECT_MAX_DELAY = 300
+
+
+class AsyncioMqttTransport:
+    """Drive the socket of a paho client from the asyncio event loop.
+
+    paho's loop_start runs the network loop in a thread of its own, so every
+    message had to be handed back to the event loop. Here the socket is
+    watched with add_reader and add_writer and the keepalive runs from a
+    loop_misc timer, so the callbacks of the client, on_message included,
+    run on the event loop.
+
+    The connection is opened in the executor, as paho connects with blocking
+    calls. paho only reconnects from its own loop, so a lost connection is
+    reopened here after a growing delay.
+    """
+
+    def __init__(
+        self,
+        client: mqtt.Client,
+        min_delay: float = RECONNECT_MIN_DELAY,
+        max_delay: float = RECONNECT_MAX_DELAY,
+    ):
+        """Initialize the transport, it must be created on the event loop.
+
+        Args:
+            client (mqtt.Client): The paho client, its loop must not be started.
+            min_delay (float): The seconds before the first reconnection.
+            max_delay (float): The maximum seconds between reconnections.
+        """
+        self.client = client
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.reconnect_delay = min_delay
+        self.reconnect_handle = None
+        self.reconnect_task = None
+        self.misc_handle = None
+        self.sock = None
+        self.fd = None
+        self.stopped = False
+        client.on_socket_open = self.on_socket_open
+        client.on_socket_close = self.on_socket_close
+        client.on_socket_register_write = self.on_socket_register_write
+        client.on_socket_unregister_write = self.on_socket_unregister_write
+
+    async def connect(self, host: str, port: int):
+        """Open the connection to the broker.
+
+        Args:
+            host (str): The broker host.
+            port (int): The broker port.
+        """
+        await self.loop.run_in_executor(None, self.client.connect, host, port)
+
+    def stop(self):
+        """Stop watching the socket and reconnecting.
+
+        A DISCONNECT queued by the client is still written, the socket is
+        closed by paho once it is.
+        """
+        self.stopped = True
+        if self.reconnect_handle is not None:
+            self.reconnect_handle.cancel()
+            self.reconnect_handle = None
+        if self.reconnect_task is not None:
+            self.reconnect_task.cancel()
+            self.reconnect_task = None
+        if self.sock is not None and self.client.want_write():
+            self.client.loop_write()
+
+    def call_on_loop(self, callback, *args):
+        """Call a socket callback on the event loop.
+
+        paho calls them from the executor while it connects.
+        """
+        if threading.get_ident() == self.thread_id:
+            callback(*args)
+        else:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    def on_socket_open(self, client, userdata, sock):
+        """Watch the socket of a new connection."""
+        self.call_on_loop(self.watch_socket, sock)
+
+    def on_socket_close(self, client, userdata, sock):
+        """Stop watching the socket and reconnect unless stopped."""
+        self.call_on_loop(self.unwatch_socket, sock)
+
+    def on_socket_register_write(self, client, userdata, sock):
+        """Watch the socket for writing while packets are queued."""
+        self.call_on_loop(self.watch_write, sock)
+
+    def on_socket_unregister_write(self, client, userdata, sock):
+        """Stop watching the socket for writing."""
+        self.call_on_loop(self.unwatch_write, sock)
+
+    def watch_socket(self, sock):
+        """Add the reader of the socket and start the keepalive timer.
+
+        Args:
+            sock: The socket, skipped if paho closed it meanwhile.
+        """
+        if sock is not self.client.socket():
+            return
+        self.sock = sock
+        self.fd = sock.fileno()
+        self.reconnect_delay = self.min_delay
+        self.loop.add_reader(self.fd, self.read)
+        # Packets queued while connecting from the executor.
+        if self.client.want_write():
+            self.loop.add_writer(self.fd, self.client.loop_write)
+        self.misc_handle = self.loop.call_later(MISC_INTERVAL, self.misc)
+        if self.stopped:
+            # Stopped while reconnecting, paho closes the socket after the DISCONNECT.
+            self.client.disconnect()
+
+    def unwatch_socket(self, sock):
+        """Remove the reader and writer of the socket and schedule a reconnection.
+
+        Args:
+            sock: The socket about to be closed.
+        """
+        if sock is not self.sock:
+            return
+        self.loop.remove_reader(self.fd)
+        self.loop.remove_writer(self.fd)
+        self.sock = None
+        self.fd = None
+        if self.misc_handle is not None:
+            self.misc_handle.cancel()
+            self.misc_handle = None
+        if not self.stopped:
+            self.schedule_reconnect()
+
+    def watch_write(self, sock):
+        """Add the writer of the socket.
+
+        Args:
+            sock: The socket with packets to write.
+        """
+        if sock is self.sock:
+            self.loop.add_writer(self.fd, self.client.loop_write)
+
+    def unwatch_write(self, sock):
+        """Remove the writer of the socket.
+
+        Args:
+            sock: The socket without packets left to write.
+        """
+        if sock is self.sock:
+            self.loop.remove_writer(self.fd)
+
+    def read(self):
+        """Read the packets available on the socket."""
+        self.client.loop_read()
+        # A TLS socket can hold decrypted data the selector does not report.
+        pending = getattr(self.sock, "pending", None)
+        if pending is not None and pending():
+            self.loop.call_soon(self.read)
+
+    def misc(self):
+        """Send the keepalive pings and detect a silent broker."""
+        self.misc_handle = None
+        if self.client.loop_misc() == mqtt.MQTT_ERR_SUCCESS and self.sock is not None:
+            self.misc_handle = self.loop.call_later(MISC_INTERVAL, self.misc)
+
+    def schedule_reconnect(self):
+        """Reconnect after the current delay, doubling it for the next attempt."""
+        if self.reconnect_handle is not None or self.reconnect_task is not None:
+            return
+        delay = self.reconnect_delay
+        self.reconnect_delay = min(delay * 2, self.max_delay)
+        _LOGGER.debug("Reconnecting to the broker in %s seconds", delay)
+        self.reconnect_handle = self.loop.call_later(delay, self.start_reconnect)
+
+    def start_reconnect(self):
+        """Start the reconnection task."""
+        self.reconnect_handle = None
+        self.reconnect_task = self.loop.create_task(self.reconnect())
+
+    async def reconnect(self):
+        """Reopen the connection with the current credentials of the client."""
+        try:
+            await self.loop.run_in_executor(None, self.client.reconnect)
+        except Exception as e:
+            _LOGGER.info("Could not reconnect to the broker: %s", e)
+            self.reconnect_task = None
+            if not self.stopped:
+                self.schedule_reconnect()
+            return
+        self.reconnect_task = None
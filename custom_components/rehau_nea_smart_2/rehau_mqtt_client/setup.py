@@ -18,6 +18,5 @@ setup(
         'httpx==0.27.0',
         'pydantic==2.6.3',
         'deepmerge==1.1.1',
-        'aiocron==1.8',
     ],
 )
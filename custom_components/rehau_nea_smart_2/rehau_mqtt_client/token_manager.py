@@ -0,0 +1,103 @@
+"""Refresh of the authentication token."""
+import asyncio
+import logging
+import random
+
+from .handlers import refresh
+from .exceptions import MqttClientAuthenticationError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds before the expiry at which the token is refreshed.
+REFRESH_MARGIN = 300
+# Up to this many seconds are taken off the refresh delay, so that several
+# clients started together do not refresh at the same time.
+REFRESH_JITTER = 60
+MIN_REFRESH_DELAY = 30
+
+
+class TokenManager:
+    """Keep the access token of an MQTT client fresh.
+
+    The token is refreshed ahead of its expiry. Refreshes are single-flight:
+    callers that saw the same token rejected wait for the refresh under way
+    instead of starting their own. A refreshed token only replaces the
+    credentials of the HTTP calls and of the next MQTT connection, so the
+    current MQTT connection is kept.
+    """
+
+    def __init__(self, mqtt_client, refresh_margin: float = REFRESH_MARGIN, jitter: float = REFRESH_JITTER):
+        """Initialize the token manager.
+
+        Args:
+            mqtt_client (MqttClient): The MQTT client owning the token data.
+            refresh_margin (float): The seconds before the expiry at which the token is refreshed.
+            jitter (float): The maximum random seconds taken off the refresh delay.
+        """
+        self.mqtt_client = mqtt_client
+        self.refresh_margin = refresh_margin
+        self.jitter = jitter
+        self.lock = asyncio.Lock()
+        self.refresh_handle = None
+
+    def schedule(self, token_data: dict):
+        """Schedule the refresh of a token from its expiry.
+
+        Args:
+            token_data (dict): The token data, with the expires_in seconds.
+        """
+        self.cancel()
+        if "expires_in" not in token_data:
+            _LOGGER.error("No token expiry found, the token is refreshed when rejected")
+            return
+
+        delay = token_data["expires_in"] - self.refresh_margin - random.uniform(0, self.jitter)
+        self.schedule_in(max(delay, MIN_REFRESH_DELAY))
+
+    def schedule_in(self, delay: float):
+        """Schedule a refresh after a delay.
+
+        Args:
+            delay (float): The seconds to wait.
+        """
+        self.cancel()
+        _LOGGER.debug("Token refresh in %.0f seconds", delay)
+        self.refresh_handle = asyncio.get_running_loop().call_later(
+            delay, lambda: self.mqtt_client.hass.async_create_task(self.refresh())
+        )
+
+    def cancel(self):
+        """Cancel the scheduled refresh."""
+        if self.refresh_handle is not None:
+            self.refresh_handle.cancel()
+            self.refresh_handle = None
+
+    async def refresh(self, rejected_token: str = None):
+        """Refresh the token, once for all the callers that saw it rejected.
+
+        Falls back to a new login when the refresh token is no longer valid.
+
+        Args:
+            rejected_token (str): The access token that was rejected, None for a scheduled refresh.
+        """
+        async with self.lock:
+            token_data = self.mqtt_client.token_data
+            if rejected_token is not None and token_data["access_token"] != rejected_token:
+                _LOGGER.debug("Token already refreshed")
+                return
+
+            _LOGGER.debug("Refreshing token")
+            try:
+                token_data = await refresh(token_data["refresh_token"])
+                self.mqtt_client.set_token_data(token_data)
+            except MqttClientAuthenticationError as e:
+                _LOGGER.error("Could not refresh token, logging in: %s", e)
+                try:
+                    await self.mqtt_client.login()
+                except Exception as e:
+                    _LOGGER.error("Error while logging in: %s", e)
+                    self.schedule_in(MIN_REFRESH_DELAY)
+            except Exception as e:
+                # The token is still valid for a while, so the refresh is retried.
+                _LOGGER.error("Error while refreshing token: %s", e)
+                self.schedule_in(MIN_REFRESH_DELAY)
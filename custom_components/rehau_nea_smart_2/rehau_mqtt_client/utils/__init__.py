@@ -2,12 +2,16 @@
 
 from .enums import OperationModes, EnergyLevels, ServerTopics, ClientTopics
 from .operating_modes import parse_operating_mode
-from .energy_levels import get_global_energy_level
+from .energy_levels import ENERGY_LEVEL_ORDER
 from .uuid_generator import generate_uuid
-from .hashing import sha256_hash, base64_url_encode, convert_challenge
+from .hashing import sha256_hash, sha256_hex, base64_url_encode, convert_challenge
 from .auth_url_generator import generate_auth_url
-from .referentials import get_by_value, replace_keys
-from .file_handler import save_as_json, read_from_json
+from .referentials import ReferentialIndex, get_by_value, replace_keys
+from .command_encoder import CommandEncoder
+from .message_decoder import MessageDecoder
+from .channel_table import ChannelTable, fahrenheit_tenths_to_celsius
+from .file_handler import save_as_json, read_from_json, remove_json
+from .http_client import create_http_client, borrow_http_client, get_ssl_context
 from .decompress import decompress_utf16, decode_base64, encode_base64
 
 
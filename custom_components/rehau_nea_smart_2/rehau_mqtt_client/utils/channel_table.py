@@ -0,0 +1,179 @@
+"""Columnar table of the channel values, with the derived values computed once per update.
+
+The API reports temperatures in tenths of a degree Fahrenheit. Instead of
+converting them on every entity read, the table gathers the channel values
+of all installations into columns and derives the Celsius temperatures, the
+per-zone averages and the global energy level vote in one go. Reads are then
+plain dictionary lookups.
+
+NumPy is used for the computation when it is installed, otherwise the same
+values are computed in pure Python.
+"""
+from .energy_levels import ENERGY_LEVEL_ORDER
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVERAGED_COLUMNS = ("current_temperature", "humidity", "demand", "energy_level")
+
+
+def fahrenheit_tenths_to_celsius(temperature, round_half=False) -> float:
+    """Convert a temperature in tenths of a degree Fahrenheit to Celsius.
+
+    Args:
+        temperature: The temperature in tenths of a degree Fahrenheit.
+        round_half (bool): Round to the nearest half degree instead of one decimal.
+
+    Returns:
+        float: The temperature in degrees Celsius.
+    """
+    converted_temperature = (temperature / 10 - 32) / 1.8
+    if round_half:
+        return round(2 * converted_temperature) / 2
+    return round(converted_temperature, 1)
+
+
+class ChannelTable:
+    """Derived channel values of a set of installation states.
+
+    Attributes:
+        zone_averages (dict): The average of each column in AVERAGED_COLUMNS, per zone id.
+        zone_temperatures (dict): The average current temperature in Celsius, per zone id.
+        current_temperatures (dict): The current temperature in Celsius, per channel id.
+        target_temperatures (dict): The target temperature in Celsius rounded to half a degree, per channel id.
+        global_energy_levels (dict): The most used energy level, per installation unique.
+    """
+
+    def __init__(self, installations: list, use_numpy: bool = None):
+        """Gather the channel columns and compute the derived values.
+
+        Args:
+            installations (list[InstallationState]): The installation states.
+            use_numpy (bool): Force or disable NumPy, by default it is used when available.
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+
+        self.zone_ids = []
+        self.channel_ids = []
+        self.installation_uniques = []
+        zone_rows = []
+        installation_rows = []
+        columns = {name: [] for name in AVERAGED_COLUMNS}
+        targets = []
+
+        for installation_row, installation in enumerate(installations):
+            self.installation_uniques.append(installation.unique)
+            for zone in installation.iter_zones():
+                zone_row = len(self.zone_ids)
+                self.zone_ids.append(zone.id)
+                for channel in zone.channels:
+                    self.channel_ids.append(channel.id)
+                    zone_rows.append(zone_row)
+                    installation_rows.append(installation_row)
+                    for name, column in columns.items():
+                        column.append(getattr(channel, name))
+                    targets.append(channel.target_temperature)
+
+        self.zone_averages = {}
+        self.zone_temperatures = {}
+        self.current_temperatures = {}
+        self.target_temperatures = {}
+        self.global_energy_levels = {}
+
+        if use_numpy:
+            self._compute_numpy(columns, targets, zone_rows, installation_rows)
+        else:
+            self._compute_python(columns, targets, zone_rows, installation_rows)
+
+    def _compute_numpy(self, columns, targets, zone_rows, installation_rows):
+        zone_rows = np.asarray(zone_rows, dtype=np.intp)
+        zone_count = len(self.zone_ids)
+        channel_counts = np.bincount(zone_rows, minlength=zone_count)
+        # Zones without channels average to nan and are left out.
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = {
+                name: np.bincount(zone_rows, weights=np.asarray(column, dtype=np.float64), minlength=zone_count)
+                / channel_counts
+                for name, column in columns.items()
+            }
+        has_channels = (channel_counts > 0).tolist()
+        for name, values in averages.items():
+            for zone_id, value, valid in zip(self.zone_ids, values.tolist(), has_channels):
+                if valid:
+                    self.zone_averages.setdefault(zone_id, {})[name] = value
+        zone_celsius = np.round((averages["current_temperature"] / 10 - 32) / 1.8, 1)
+        for zone_id, value, valid in zip(self.zone_ids, zone_celsius.tolist(), has_channels):
+            if valid:
+                self.zone_temperatures[zone_id] = value
+
+        current = np.asarray(columns["current_temperature"], dtype=np.float64)
+        self.current_temperatures = dict(zip(self.channel_ids, np.round((current / 10 - 32) / 1.8, 1).tolist()))
+        target = np.asarray([-1 if value is None else value for value in targets], dtype=np.float64)
+        # A target of 0 or below falls back to the current temperature.
+        target = np.where(target > 0, target, current)
+        target_celsius = (np.round(2 * ((target / 10 - 32) / 1.8)) / 2).tolist()
+        self.target_temperatures = {
+            channel_id: None if value is None else celsius
+            for channel_id, value, celsius in zip(self.channel_ids, targets, target_celsius)
+        }
+
+        levels = np.asarray(columns["energy_level"], dtype=np.intp)
+        installation_rows = np.asarray(installation_rows, dtype=np.intp)
+        votes = np.zeros((len(self.installation_uniques), len(ENERGY_LEVEL_ORDER)), dtype=np.intp)
+        for position, level in enumerate(ENERGY_LEVEL_ORDER):
+            votes[:, position] = np.bincount(
+                installation_rows[levels == level], minlength=len(self.installation_uniques)
+            )
+        for unique, position in zip(self.installation_uniques, votes.argmax(axis=1).tolist()):
+            self.global_energy_levels[unique] = ENERGY_LEVEL_ORDER[position]
+
+    def _compute_python(self, columns, targets, zone_rows, installation_rows):
+        zone_count = len(self.zone_ids)
+        channel_counts = [0] * zone_count
+        for zone_row in zone_rows:
+            channel_counts[zone_row] += 1
+        for name, column in columns.items():
+            sums = [0] * zone_count
+            for zone_row, value in zip(zone_rows, column):
+                sums[zone_row] += value
+            for zone_id, total, count in zip(self.zone_ids, sums, channel_counts):
+                if count:
+                    self.zone_averages.setdefault(zone_id, {})[name] = total / count
+        for zone_id, averages in self.zone_averages.items():
+            self.zone_temperatures[zone_id] = fahrenheit_tenths_to_celsius(averages["current_temperature"])
+
+        for channel_id, current, target in zip(self.channel_ids, columns["current_temperature"], targets):
+            self.current_temperatures[channel_id] = fahrenheit_tenths_to_celsius(current)
+            if target is None:
+                self.target_temperatures[channel_id] = None
+            else:
+                self.target_temperatures[channel_id] = fahrenheit_tenths_to_celsius(
+                    target if target > 0 else current, True
+                )
+
+        votes = [dict.fromkeys(ENERGY_LEVEL_ORDER, 0) for _ in self.installation_uniques]
+        for installation_row, level in zip(installation_rows, columns["energy_level"]):
+            if level in votes[installation_row]:
+                votes[installation_row][level] += 1
+        for unique, vote in zip(self.installation_uniques, votes):
+            self.global_energy_levels[unique] = max(vote, key=vote.get)
+
+    def get_zone_average(self, zone_id, key: str):
+        """Retrieve the average of a column over the channels of a zone.
+
+        Args:
+            zone_id: The zone id.
+            key (str): The column name, one of AVERAGED_COLUMNS.
+
+        Returns:
+            float or None: The average, or None if the zone has no channels or the column is not averaged.
+        """
+        averages = self.zone_averages.get(zone_id)
+        if averages is None:
+            return None
+        return averages.get(key)
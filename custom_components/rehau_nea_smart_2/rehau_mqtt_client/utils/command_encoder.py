@@ -0,0 +1,96 @@
+"""Command encoders compiled from the referentials."""
+from .referentials import ReferentialIndex
+
+REQUEST_TYPE = "REQ_TH"
+
+
+class CommandEncoder:
+    """Encode the REQ_TH commands for one version of the referentials.
+
+    The keys of every command are translated to referential indexes once,
+    when the encoder is built. Encoding a command then only fills the values
+    into a pre-keyed request, without walking it through replace_keys. The
+    result is the same request replace_keys would produce.
+    """
+
+    def __init__(self, index: ReferentialIndex):
+        """Compile the command keys against the referential index.
+
+        Args:
+            index (ReferentialIndex): The referential index.
+        """
+        self.index = index
+        self.keys = {}
+        self.controller_key, self.data_key, self.type_key, self.zone_key = (
+            self.get_key(name) for name in ("controller", "data", "type", "zone")
+        )
+        self.mode_used_key = self.get_key("mode_used")
+        self.zone_impacted_key = self.get_key("zone_impacted")
+        self.heat_cool_key = self.get_key("heat_cool")
+
+    def get_key(self, name: str) -> str:
+        """Retrieve the wire key for a field name.
+
+        Args:
+            name (str): The field name.
+
+        Returns:
+            str: The referential index of the field, or the name itself if it has none.
+        """
+        key = self.keys.get(name)
+        if key is None:
+            key = self.index.get_index(name)
+            if key is None:
+                key = name
+            self.keys[name] = key
+        return key
+
+    def encode_zone_command(self, zone, field: str, value, controller=0) -> dict:
+        """Encode a command setting one field of a zone.
+
+        Args:
+            zone: The zone id.
+            field (str): The name of the data field, such as setpoint_used or mode_permanent.
+            value: The value of the data field.
+            controller: The controller number.
+
+        Returns:
+            dict: The request with referential keys.
+        """
+        return {
+            self.controller_key: controller,
+            self.data_key: {self.get_key(field): value},
+            self.type_key: REQUEST_TYPE,
+            self.zone_key: zone,
+        }
+
+    def encode_global_energy_level(self, mode, zones: list, controller=0) -> dict:
+        """Encode a command setting the energy level of several zones.
+
+        Args:
+            mode: The energy level.
+            zones (list): The numbers of the impacted zones.
+            controller: The controller number.
+
+        Returns:
+            dict: The request with referential keys.
+        """
+        return {
+            self.controller_key: controller,
+            self.data_key: {self.mode_used_key: mode, self.zone_impacted_key: zones},
+            self.type_key: REQUEST_TYPE,
+        }
+
+    def encode_operation_mode(self, mode: str) -> dict:
+        """Encode a command setting the operation mode of the installation.
+
+        Args:
+            mode (str): The zero padded operation mode.
+
+        Returns:
+            dict: The request with referential keys.
+        """
+        return {
+            self.data_key: {self.heat_cool_key: mode},
+            self.type_key: REQUEST_TYPE,
+        }
@@ -1,11 +1,11 @@
 """Decompression utilities for Rehau NEA Smart 2."""
-from .lzstring import LZString
+from .lzstring_fast import decompress_from_utf16
 import json
 import base64
 
 
 def decompress_utf16(data: str):
-    """Decompress a UTF-16 encoded string using LZString library.
+    """Decompress a UTF-16 encoded string using the table-driven LZString decoder.
 
     Args:
         data (str): The UTF-16 encoded string to decompress.
@@ -14,7 +14,7 @@ def decompress_utf16(data: str):
         dict: The decompressed JSON object.
 
     """
-    decoded_text = LZString.decompressFromUTF16(data)
+    decoded_text = decompress_from_utf16(data)
     return json.loads(decoded_text)
 
 
@@ -1,4 +1,5 @@
 """Helper function for saving data as JSON."""
+import contextlib
 import os
 import json
 
@@ -40,3 +41,15 @@ def read_from_json(file_name) -> list:
             return data
     except FileNotFoundError:
         return []
+
+
+def remove_json(file_name):
+    """Remove the specified file, if it exists.
+
+    Args:
+        file_name (str): The name of the file.
+    """
+    data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+    file_path = os.path.join(data_dir, file_name)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(file_path)
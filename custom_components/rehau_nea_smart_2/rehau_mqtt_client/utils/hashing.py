@@ -40,3 +40,15 @@ async def convert_challenge(challenge):
     hash_result = await sha256_hash(challenge)
     result = base64_url_encode(hash_result)
     return result
+
+
+def sha256_hex(input_str: str) -> str:
+    """Compute the hexadecimal SHA-256 digest of the input string.
+
+    Args:
+        input_str (str): The input string to be hashed.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    return hashlib.sha256(input_str.encode("utf-8", "surrogatepass")).hexdigest()
@@ -0,0 +1,71 @@
+"""Shared HTTP client for the REHAU API and account calls."""
+import contextlib
+import functools
+import ssl
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+HTTP_TIMEOUT = 30
+MAX_KEEPALIVE_CONNECTIONS = 4
+KEEPALIVE_EXPIRY = 120
+
+
+@functools.lru_cache(maxsize=1)
+def get_ssl_context() -> ssl.SSLContext:
+    """Get the SSL context shared by the HTTP clients.
+
+    Loading the CA certificates is slow, so it is done once.
+
+    Returns:
+        ssl.SSLContext: The default SSL context.
+    """
+    return ssl.create_default_context()
+
+
+def create_http_client(http2: bool = None) -> httpx.AsyncClient:
+    """Create a pooled HTTP client keeping its connections alive between polls.
+
+    The polls run every minute, so the idle connections are kept for
+    longer than that to skip the TCP and TLS handshakes.
+
+    Args:
+        http2 (bool): Use HTTP/2, by default when the h2 package is installed.
+
+    Returns:
+        httpx.AsyncClient: The HTTP client, to be closed with aclose.
+    """
+    if http2 is None:
+        http2 = HTTP2_AVAILABLE
+    return httpx.AsyncClient(
+        http2=http2,
+        verify=get_ssl_context(),
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+@contextlib.asynccontextmanager
+async def borrow_http_client(client: httpx.AsyncClient = None):
+    """Use the given HTTP client, or a short lived one when there is none.
+
+    Args:
+        client (httpx.AsyncClient): The pooled client, left open.
+
+    Yields:
+        httpx.AsyncClient: The HTTP client to send the requests with.
+    """
+    if client is not None:
+        yield client
+        return
+    async with create_http_client() as new_client:
+        yield new_client
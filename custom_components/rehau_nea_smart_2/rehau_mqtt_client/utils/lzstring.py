@@ -13,8 +13,6 @@ Classes:
 Note: This module is based on the work of Marcel Dancak and is licensed under the Do What The Fuck You Want To Public License, Version 2.
 """
 
-import math
-
 
 keyStrBase64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
 keyStrUriSafe = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-$"
@@ -66,32 +64,79 @@ def _compress(uncompressed, bitsPerChar, getCharFromInt):
         return ""
 
     context_dictionary = {}
-    context_c = ""
+    context_dictionaryToCreate = set()
     context_w = ""
+    context_enlargeIn = 2  # Compensate for the first entry which should not count
+    context_dictSize = 3
+    context_numBits = 2
     context_data = []
-    context_data_val = 0
-    context_data_position = 0
+    data = Object(val=0, position=0)
+
+    def write_bits(value, num_bits):
+        for _ in range(num_bits):
+            data.val = (data.val << 1) | (value & 1)
+            if data.position == bitsPerChar - 1:
+                data.position = 0
+                context_data.append(getCharFromInt(data.val))
+                data.val = 0
+            else:
+                data.position += 1
+            value >>= 1
+
+    def write_w():
+        nonlocal context_enlargeIn, context_numBits
+        if context_w in context_dictionaryToCreate:
+            if ord(context_w[0]) < 256:
+                write_bits(0, context_numBits)
+                write_bits(ord(context_w[0]), 8)
+            else:
+                write_bits(1, context_numBits)
+                write_bits(ord(context_w[0]), 16)
+            context_enlargeIn -= 1
+            if context_enlargeIn == 0:
+                context_enlargeIn = 2 ** context_numBits
+                context_numBits += 1
+            context_dictionaryToCreate.discard(context_w)
+        else:
+            write_bits(context_dictionary[context_w], context_numBits)
+
+        context_enlargeIn -= 1
+        if context_enlargeIn == 0:
+            context_enlargeIn = 2 ** context_numBits
+            context_numBits += 1
 
     for context_c in uncompressed:
         if context_c not in context_dictionary:
-            context_dictionary[context_c] = len(context_dictionary) + 1
-            context_data.append(getCharFromInt(context_dictionary[context_c]))
+            context_dictionary[context_c] = context_dictSize
+            context_dictSize += 1
+            context_dictionaryToCreate.add(context_c)
+
+        context_wc = context_w + context_c
+        if context_wc in context_dictionary:
+            context_w = context_wc
         else:
-            context_w += context_c
+            write_w()
+            # Add wc to the dictionary.
+            context_dictionary[context_wc] = context_dictSize
+            context_dictSize += 1
+            context_w = context_c
 
-        context_data_val = (context_data_val << bitsPerChar) | context_dictionary[context_c]
-        context_data_position += bitsPerChar
+    # Output the code for w.
+    if context_w != "":
+        write_w()
 
-        while context_data_position >= 8:
-            context_data.append(getCharFromInt(context_data_val & 0xFF))
-            context_data_val >>= 8
-            context_data_position -= 8
+    # Mark the end of the stream
+    write_bits(2, context_numBits)
 
-    # Flush the last character
-    if context_data_position > 0:
-        context_data.append(getCharFromInt(context_data_val & ((1 << context_data_position) - 1)))
+    # Flush the last char
+    while True:
+        data.val <<= 1
+        if data.position == bitsPerChar - 1:
+            context_data.append(getCharFromInt(data.val))
+            break
+        data.position += 1
 
-    return ''.join(context_data)
+    return "".join(context_data)
 
 def _decompress(length, resetValue, getNextValue):
     def get_next_bits(num_bits, data, resetValue, getNextValue):
@@ -0,0 +1,128 @@
+"""Table-driven LZString decoder for the UTF-16 flavour used by referential payloads.
+
+The generic decoder in ``lzstring`` pulls one bit at a time through a lambda and a
+nested closure. This module converts the input to an integer array once, reverses
+the bit order of every 15 bit word through a lookup table and then reads whole
+codes out of a bit buffer using precomputed masks. The output is identical to
+``LZString.decompressFromUTF16``.
+"""
+
+UTF16_BITS_PER_CHAR = 15
+UTF16_CHAR_OFFSET = 32
+
+_WORD_MASK = (1 << UTF16_BITS_PER_CHAR) - 1
+_BIT_MASKS = [(1 << bits) - 1 for bits in range(64)]
+_reversed_words = None
+
+
+def _get_reversed_words() -> list[int]:
+    """Return the lookup table mapping a 15 bit word to its bit-reversed value.
+
+    The table is built lazily on first use and shared afterwards.
+
+    Returns:
+        list[int]: The bit-reversed value for every 15 bit word.
+    """
+    global _reversed_words
+    if _reversed_words is None:
+        table = [0] * (1 << UTF16_BITS_PER_CHAR)
+        for word in range(1, 1 << UTF16_BITS_PER_CHAR):
+            table[word] = (table[word >> 1] >> 1) | ((word & 1) << (UTF16_BITS_PER_CHAR - 1))
+        _reversed_words = table
+    return _reversed_words
+
+
+def to_words(compressed: str) -> list[int]:
+    """Convert a UTF-16 compressed string to its bit-reversed integer words.
+
+    Args:
+        compressed (str): The compressed string in UTF-16 format.
+
+    Returns:
+        list[int]: The words of the stream, least significant bit first.
+    """
+    reversed_words = _get_reversed_words()
+    return [reversed_words[(ord(char) - UTF16_CHAR_OFFSET) & _WORD_MASK] for char in compressed]
+
+
+def decompress_from_utf16(compressed: str):
+    """Decompress a compressed string in UTF-16 format.
+
+    Args:
+        compressed (str): The compressed string in UTF-16 format to be decompressed.
+
+    Returns:
+        str: The decompressed string, or None for an empty or corrupt input.
+    """
+    if compressed is None:
+        return ""
+    if compressed == "":
+        return None
+
+    words = to_words(compressed)
+    masks = _BIT_MASKS
+    buffer = 0
+    buffered_bits = 0
+    position = 0
+
+    def read_bits(num_bits: int) -> int:
+        nonlocal buffer, buffered_bits, position
+        while buffered_bits < num_bits:
+            buffer |= words[position] << buffered_bits
+            position += 1
+            buffered_bits += UTF16_BITS_PER_CHAR
+        value = buffer & masks[num_bits]
+        buffer >>= num_bits
+        buffered_bits -= num_bits
+        return value
+
+    first = read_bits(2)
+    if first == 0:
+        c = chr(read_bits(8))
+    elif first == 1:
+        c = chr(read_bits(16))
+    else:
+        return ""
+
+    # Codes 0, 1 and 2 are reserved, the placeholders keep indexes aligned.
+    dictionary = [None, None, None, c]
+    result = [c]
+    w = c
+    enlarge_in = 4
+    num_bits = 3
+
+    while True:
+        # Inlined read_bits(num_bits), this is the hot path of the decoder.
+        while buffered_bits < num_bits:
+            buffer |= words[position] << buffered_bits
+            position += 1
+            buffered_bits += UTF16_BITS_PER_CHAR
+        code = buffer & masks[num_bits]
+        buffer >>= num_bits
+        buffered_bits -= num_bits
+
+        if code == 0 or code == 1:
+            dictionary.append(chr(read_bits(8 if code == 0 else 16)))
+            code = len(dictionary) - 1
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+        elif code == 2:
+            return "".join(result)
+
+        dict_size = len(dictionary)
+        if code < dict_size:
+            entry = dictionary[code]
+        elif code == dict_size:
+            entry = w + w[0]
+        else:
+            return None
+        result.append(entry)
+
+        dictionary.append(w + entry[0])
+        enlarge_in -= 1
+        w = entry
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
@@ -0,0 +1,110 @@
+"""Decoder mapping referential indexes in incoming messages back to field names."""
+from .referentials import ReferentialIndex
+
+# Stands for the keys of a level that are not field names, such as the
+# "00" channel of LIVE_DIDO. Their values are decoded with the given level.
+ANY_KEY = "*"
+
+# The values of the circuits in the live data, keyed by MC0 or a channel.
+_LIVE_CIRCUIT_FIELDS = {
+    "pumpOn": None,
+    "mixed_circuit1_setpoint": None,
+    "mixed_circuit1_supply": None,
+    "mixed_circuit1_return": None,
+    "mixed_circuit1_opening": None,
+    "DI": None,
+    "DO": None,
+}
+
+# The field names the handlers read in the data of each user message type.
+# Each level maps a field name to the level of its value, None when the value
+# is left as is.
+MESSAGE_FIELDS = {
+    "channel_update": {
+        "channel": None,
+        "unique": None,
+        "data": {
+            "mode_used": None,
+            "setpoint_used": None,
+        },
+    },
+    "live_data": {
+        "type": None,
+        "unique": None,
+        "data": {
+            "MC0": _LIVE_CIRCUIT_FIELDS,
+            ANY_KEY: _LIVE_CIRCUIT_FIELDS,
+        },
+    },
+}
+
+
+class MessageDecoder:
+    """Translate index-keyed incoming messages for one version of the referentials.
+
+    A key map from index to name is compiled for every level MESSAGE_FIELDS
+    describes, restricted to the names the handlers read. Decoding a message
+    walks those levels only, with one dict lookup per key, so the values and
+    the keys of other levels are never renamed.
+    """
+
+    def __init__(self, index: ReferentialIndex):
+        """Compile the key maps against the referential index.
+
+        Args:
+            index (ReferentialIndex): The referential index.
+        """
+        self.index = index
+        self.key_maps = {
+            message_type: _compile(fields, index)
+            for message_type, fields in MESSAGE_FIELDS.items()
+        }
+
+    def decode(self, message: dict) -> dict:
+        """Replace the referential indexes in the data of a message with field names.
+
+        Messages already using field names are returned unchanged.
+
+        Args:
+            message (dict): The parsed user message.
+
+        Returns:
+            dict: The message with field names.
+        """
+        key_map = self.key_maps.get(message.get("type"))
+        if key_map is None or "data" not in message:
+            return message
+        message["data"] = _translate(message["data"], key_map)
+        return message
+
+
+def _compile(fields: dict | None, index: ReferentialIndex):
+    """Compile a level of MESSAGE_FIELDS into (key map, level of the other keys)."""
+    if fields is None:
+        return None
+    key_map = {}
+    for name, sub_fields in fields.items():
+        if name == ANY_KEY:
+            continue
+        entry = (name, _compile(sub_fields, index))
+        key_map[name] = entry
+        wire_key = index.get_index(name)
+        if wire_key is not None:
+            key_map[wire_key] = entry
+    return key_map, _compile(fields.get(ANY_KEY), index)
+
+
+def _translate(value, level):
+    """Rename the keys of value described by a compiled level."""
+    if level is None or not isinstance(value, dict):
+        return value
+    key_map, other_level = level
+    translated = {}
+    for key, item in value.items():
+        entry = key_map.get(key)
+        if entry is None:
+            translated[key] = _translate(item, other_level)
+        else:
+            name, sub_level = entry
+            translated[name] = _translate(item, sub_level)
+    return translated
@@ -1,5 +1,55 @@
 """Referentials utilities."""
 
+
+class ReferentialIndex:
+    """Bidirectional lookup between referential values and indexes.
+
+    The referential list maps field names (values) to the short keys (indexes)
+    used on the wire. The index is built once per referential update so that
+    translating a message does not scan the whole list for every key.
+    """
+
+    def __init__(self, referentials: list):
+        """Build the lookup maps from the referentials list.
+
+        Args:
+            referentials (list): The list of referentials.
+        """
+        self.referentials = referentials
+        self.index_by_value = {}
+        self.value_by_index = {}
+        for item in referentials:
+            # Keep the first match for duplicates, like the linear scan did.
+            self.index_by_value.setdefault(str(item["value"]), str(item["index"]))
+            self.value_by_index.setdefault(str(item["index"]), item["value"])
+
+    def __len__(self) -> int:
+        """Return the number of referential entries."""
+        return len(self.referentials)
+
+    def get_index(self, value):
+        """Retrieve the index for a referential value.
+
+        Args:
+            value: The value to search for.
+
+        Returns:
+            str or None: The index as a string, or None if not found.
+        """
+        return self.index_by_value.get(str(value))
+
+    def get_value(self, index):
+        """Retrieve the referential value for an index.
+
+        Args:
+            index: The index to search for.
+
+        Returns:
+            The referential value, or None if not found.
+        """
+        return self.value_by_index.get(str(index))
+
+
 def get_by_value(value, referentials):
     """Retrieve the item from the referentials list based on the provided value.
 
@@ -14,11 +64,11 @@ def get_by_value(value, referentials):
 
 
 def replace_keys(input_object, referentials):
-    """Replace the keys in the input_object dictionary based on the referentials list.
+    """Replace the keys in the input_object dictionary based on the referentials.
 
     Args:
         input_object (dict): The input dictionary.
-        referentials (list): The list of referentials.
+        referentials (ReferentialIndex | list): The referential index, or the list of referentials.
 
     Returns:
         dict: The modified input dictionary with replaced keys.
@@ -26,21 +76,20 @@ def replace_keys(input_object, referentials):
     if not isinstance(input_object, dict):
         return input_object
 
+    if not isinstance(referentials, ReferentialIndex):
+        referentials = ReferentialIndex(referentials)
+
+    index_by_value = referentials.index_by_value
     for key in list(input_object.keys()):
-        if isinstance(input_object[key], list):
-            if get_by_value(key, referentials):
-                index = str(get_by_value(key, referentials)["index"])
-                input_object[index] = [replace_keys(item, referentials) for item in input_object[key]]
-                del input_object[key]
-        elif isinstance(input_object[key], dict):
-            if get_by_value(key, referentials):
-                index = str(get_by_value(key, referentials)["index"])
-                input_object[index] = replace_keys(input_object[key], referentials)
-                del input_object[key]
-        else:
-            if get_by_value(key, referentials):
-                index = str(get_by_value(key, referentials)["index"])
-                input_object[index] = input_object[key]
-                del input_object[key]
+        index = index_by_value.get(str(key))
+        if index is None:
+            continue
+
+        value = input_object.pop(key)
+        if isinstance(value, list):
+            value = [replace_keys(item, referentials) for item in value]
+        elif isinstance(value, dict):
+            value = replace_keys(value, referentials)
+        input_object[index] = value
 
     return input_object
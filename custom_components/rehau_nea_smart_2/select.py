@@ -12,6 +12,7 @@ from .rehau_mqtt_client.Controller import Controller
 
 from .const import DOMAIN, PRESET_OPERATING_MODES_MAPPING, PRESET_ENERGY_LEVELS_MAPPING, \
     PRESET_OPERATING_MODES_MAPPING_REVERSE, PRESET_ENERGY_LEVELS_MAPPING_REVERSE
+from .entity import StateFingerprintMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +29,7 @@ async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the Select platform."""
     controller: Controller = hass.data[DOMAIN][entry.entry_id]
 
-    installations: list[Installation] = controller.get_installations()
+    installations: tuple[Installation, ...] = controller.get_installations()
     installation = installations[0]
     operation_mode = installation.operating_mode
     energy_level = installation.global_energy_level
@@ -44,7 +45,7 @@ async def async_setup_entry(hass, entry, async_add_devices):
     async_add_devices(devices)
 
 
-class RehauNeaSmart2GenericSelect(SelectEntity, RestoreEntity):
+class RehauNeaSmart2GenericSelect(StateFingerprintMixin, SelectEntity, RestoreEntity):
     """Generic Select class for rehau_nea_smart_2."""
 
     _attr_has_entity_name = False
@@ -59,11 +60,15 @@ class RehauNeaSmart2GenericSelect(SelectEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._unique)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._unsubscribe()
+
+    def state_fingerprint(self) -> tuple:
+        """Return the rendered values of the Select state."""
+        return (self.available, self.current_option)
 
     @property
     def device_info(self):
@@ -121,7 +126,7 @@ class RehauNeaSmart2OperationModeSelect(RehauNeaSmart2GenericSelect):
         Returns:
             The current option for the select entity.
         """
-        installations: list[Installation] = self._controller.get_installations()
+        installations: tuple[Installation, ...] = self._controller.get_installations()
         installation = installations[0]
         operation_mode = installation.operating_mode
         if operation_mode is not None:
@@ -169,7 +174,7 @@ class RehauNeaSmart2OperationEnergyLevelSelect(RehauNeaSmart2GenericSelect):
         Returns:
             The current option for the select component.
         """
-        installations: list[Installation] = self._controller.get_installations()
+        installations: tuple[Installation, ...] = self._controller.get_installations()
         installation = installations[0]
         energy_level = installation.global_energy_level
         if energy_level is not None:
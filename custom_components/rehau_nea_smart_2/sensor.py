@@ -12,10 +12,11 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 
-from .rehau_mqtt_client import Installation, Zone, LiveEmu
+from .rehau_mqtt_client import Installation, Zone, LiveEmu, LIVE_EMU, fahrenheit_tenths_to_celsius
 from .rehau_mqtt_client.Controller import Controller
 
 from .const import DOMAIN
+from .entity import StateFingerprintMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the sensor platform."""
     controller: Controller = hass.data[DOMAIN][entry.entry_id]
 
-    installations: list[Installation] = controller.get_installations()
+    installations: tuple[Installation, ...] = controller.get_installations()
 
     devices = []
 
@@ -94,7 +95,7 @@ async def async_setup_entry(hass, entry, async_add_devices):
     async_add_devices(devices)
 
 
-class RehauNeasmartGenericSensor(SensorEntity, RestoreEntity):
+class RehauNeasmartGenericSensor(StateFingerprintMixin, SensorEntity, RestoreEntity):
     """Generic sensor class for Rehau Neasmart."""
 
     _attr_has_entity_name = False
@@ -109,15 +110,19 @@ class RehauNeasmartGenericSensor(SensorEntity, RestoreEntity):
         self._zone_number = zone.number
         self._name = zone.name
         self._installation_unique = installation_unique
-        self._state = round((zone.channels[0].current_temperature / 10 - 32) / 1.8, 1)
+        self._state = fahrenheit_tenths_to_celsius(zone.channels[0].current_temperature)
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._installation_unique, zone_id=self._id)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._unsubscribe()
+
+    def state_fingerprint(self) -> tuple:
+        """Return the rendered values of the sensor state."""
+        return (self.available, self.state)
 
     @property
     def device_info(self):
@@ -189,7 +194,7 @@ class RehauNeasmart2HumiditySensor(RehauNeasmartGenericSensor):
         val = self._controller.get_humidity(self._id)
         return val if val>0 else None
 
-class RehauNeasmart2OutdoorTemperatureSensor(SensorEntity, RestoreEntity):
+class RehauNeasmart2OutdoorTemperatureSensor(StateFingerprintMixin, SensorEntity, RestoreEntity):
     """Temperature sensor class for outdoor Rehau Neasmart."""
 
     device_class = TEMPERATURE
@@ -206,7 +211,7 @@ class RehauNeasmart2OutdoorTemperatureSensor(SensorEntity, RestoreEntity):
         self._name = f"{name}"
         self._propertyname = propertyname
         self._installation_unique = installation.unique
-        self._state = round((getattr(self._installation, propertyname) / 10 - 32) / 1.8, 1)
+        self._state = fahrenheit_tenths_to_celsius(getattr(self._installation, propertyname))
         self._unique_name = name.lower().replace(" ", "_")
         self._attr_unique_id = f"{self._installation_unique}_{self._unique_name}"
         self._attr_name = self._name
@@ -214,11 +219,15 @@ class RehauNeasmart2OutdoorTemperatureSensor(SensorEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._installation_unique)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._unsubscribe()
+
+    def state_fingerprint(self) -> tuple:
+        """Return the rendered values of the sensor state."""
+        return (self.available, self.state)
 
     @property
     def device_info(self):
@@ -239,16 +248,16 @@ class RehauNeasmart2OutdoorTemperatureSensor(SensorEntity, RestoreEntity):
     def native_value(self) -> float | None:
         """Return the native value of the sensor."""
         installation = self._controller.get_installation_by_unique(self._installation_unique)
-        return round((installation.get(self._propertyname) / 10 - 32) / 1.8, 1)
+        return fahrenheit_tenths_to_celsius(getattr(installation, self._propertyname))
 
     @property
     def state(self):
         """Return the state of the sensor."""
         installation = self._controller.get_installation_by_unique(self._installation_unique)
-        return round((installation.get(self._propertyname) / 10 - 32) / 1.8, 1)
+        return fahrenheit_tenths_to_celsius(getattr(installation, self._propertyname))
 
 
-class RehauNeasmart2LiveEmuTemperatureSensor(SensorEntity, RestoreEntity):
+class RehauNeasmart2LiveEmuTemperatureSensor(StateFingerprintMixin, SensorEntity, RestoreEntity):
     """Temperature sensor class for outdoor Rehau Neasmart."""
 
     device_class = TEMPERATURE
@@ -265,7 +274,7 @@ class RehauNeasmart2LiveEmuTemperatureSensor(SensorEntity, RestoreEntity):
         self._name = f"{name}"
         self._propertyname = propertyname
         self._live_emu_unique = live_emu["unique"]
-        self._state = round((live_emu.get(propertyname) / 10 - 32) / 1.8, 1) if live_emu.get(propertyname) is not None else None
+        self._state = fahrenheit_tenths_to_celsius(live_emu.get(propertyname)) if live_emu.get(propertyname) is not None else None
         self._unique_name = name.lower().replace(" ", "_")
         self._attr_unique_id = f"{self._live_emu_unique}_{self._unique_name}"
         self._attr_name = self._name
@@ -273,11 +282,15 @@ class RehauNeasmart2LiveEmuTemperatureSensor(SensorEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._unsubscribe = self._controller.subscribe(self._handle_state_changes, self._live_emu_unique, live=LIVE_EMU)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._unsubscribe()
+
+    def state_fingerprint(self) -> tuple:
+        """Return the rendered values of the sensor state."""
+        return (self.available, self.state)
 
     @property
     def device_info(self):
@@ -298,11 +311,11 @@ class RehauNeasmart2LiveEmuTemperatureSensor(SensorEntity, RestoreEntity):
     def native_value(self) -> float | None:
         """Return the native value of the sensor."""
         live_emu = self._controller.get_live_emu_by_unique(self._live_emu_unique)
-        return round((live_emu.get(self._propertyname) / 10 - 32) / 1.8, 1) if live_emu.get(self._propertyname) is not None else None
+        return fahrenheit_tenths_to_celsius(live_emu.get(self._propertyname)) if live_emu.get(self._propertyname) is not None else None
 
     @property
     def state(self):
         """Return the state of the sensor."""
         live_emu = self._controller.get_live_emu_by_unique(self._live_emu_unique)
-        return round((live_emu.get(self._propertyname) / 10 - 32) / 1.8, 1) if live_emu.get(self._propertyname) is not None else None
+        return fahrenheit_tenths_to_celsius(live_emu.get(self._propertyname)) if live_emu.get(self._propertyname) is not None else None
 
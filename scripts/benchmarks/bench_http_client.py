@@ -0,0 +1,111 @@
+"""Compare the per-poll latency of a new HTTP client per request with the pooled client.
+
+Before the pooled client, every poll opened its own httpx.AsyncClient, so
+each request paid for loading the CA certificates, the TCP connection and
+the TLS handshake. The pooled client keeps the connection alive between
+polls. A local HTTPS server with a self-signed certificate stands in for
+the API, so the numbers show the connection overhead and not the network.
+
+Usage: python3 scripts/benchmarks/bench_http_client.py [polls]
+
+It needs httpx installed and the openssl command to create the certificate.
+"""
+import asyncio
+import http.server
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+from fixtures import CLIENT_DIR  # noqa: F401
+from utils.http_client import create_http_client, get_ssl_context
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Answer every GET with a small JSON body, keeping the connection open."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b'{"data": {"user": {}}}'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory):
+    """Start a local HTTPS server and return it with the certificate path."""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+         "-keyout", key, "-out", cert],
+        check=True,
+        capture_output=True,
+    )
+    server = http.server.ThreadingHTTPServer(("localhost", 0), Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, cert
+
+
+async def poll_new_client(url, cert, polls):
+    """Open a client per poll, as the handlers did before."""
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        async with httpx.AsyncClient(verify=cert) as client:
+            (await client.get(url)).json()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def poll_pooled_client(url, polls):
+    """Reuse one pooled client for every poll."""
+    latencies = []
+    async with create_http_client(http2=False) as client:
+        for _ in range(polls):
+            start = time.perf_counter()
+            (await client.get(url)).json()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name, latencies):
+    print(
+        f"{name:<24} median {statistics.median(latencies) * 1000:7.2f}ms"
+        f"  first {latencies[0] * 1000:7.2f}ms  max {max(latencies) * 1000:7.2f}ms"
+    )
+
+
+def main():
+    polls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as directory:
+        server, cert = start_server(directory)
+        url = f"https://localhost:{server.server_address[1]}/v1/users/user/getDataofInstall"
+        # The shared context has to trust the self-signed certificate.
+        get_ssl_context().load_verify_locations(cert)
+        try:
+            report("new client per poll", asyncio.run(poll_new_client(url, cert, polls)))
+            report("pooled client", asyncio.run(poll_pooled_client(url, polls)))
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
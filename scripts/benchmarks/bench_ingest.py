@@ -0,0 +1,142 @@
+"""Compare the installation ingest before and after the single-pass parser.
+
+The legacy parser is reproduced here: it builds nested dicts, walks the
+channels a second time for the global energy level and parses the
+lastConnection timestamp on every poll. The current parser is measured for
+a first load and for a steady-state poll merged into the existing state.
+
+Usage: python3 scripts/benchmarks/bench_ingest.py [zones] [rounds]
+
+Unlike the other benchmarks this one imports the handlers package, so it
+needs the integration dependencies (Home Assistant, pydantic) installed.
+"""
+import copy
+import datetime
+import os
+import sys
+import timeit
+
+from fixtures import CLIENT_DIR, make_installation
+
+# The handlers use relative imports, so they are imported through the package.
+# The integration directory is appended so that its select.py cannot shadow
+# the standard library module.
+sys.path.append(os.path.dirname(CLIENT_DIR))
+
+from rehau_mqtt_client.handlers.installation import merge_installations, parse_installations  # noqa: E402
+from rehau_mqtt_client.utils import EnergyLevels, parse_operating_mode  # noqa: E402
+
+
+def get_global_energy_level_legacy(installation) -> EnergyLevels:
+    """Count the energy levels in a separate pass over the channels."""
+    mode_count = dict.fromkeys((level.value for level in EnergyLevels), 0)
+    for group in installation["groups"]:
+        for zone in group["zones"]:
+            for channel in zone["channels"]:
+                if channel["mode_permanent"] in mode_count:
+                    mode_count[channel["mode_permanent"]] += 1
+    return EnergyLevels(max(mode_count, key=mode_count.get))
+
+
+def is_installation_connected_legacy(installation) -> bool:
+    """Check the connection state, parsing the timestamp every time."""
+    if "lastConnection" in installation and "connectionState" in installation:
+        last_connection_date = datetime.datetime.strptime(installation["lastConnection"], "%Y-%m-%dT%H:%M:%S.%fZ")
+        return installation["connectionState"] and last_connection_date is not None
+    return False
+
+
+def parse_installations_legacy(installations, last_operation_mode) -> list[dict]:
+    """Parse the installations into nested dicts, as before the state model."""
+    return [
+        {
+            "id": installation["_id"],
+            "connected": is_installation_connected_legacy(installation),
+            "unique": installation["unique"],
+            "outside_temp": installation["outside_temp"],
+            "outsideTempFiltered": installation["outsideTempFiltered"],
+            "hash": installation["hash"] if "hash" in installation else None,
+            "global_energy_level": get_global_energy_level_legacy(installation).value,
+            "operating_mode": parse_operating_mode(
+                installation["user"]["heatcool_auto_01"] if "user" in installation else last_operation_mode
+            ),
+            "groups": [
+                {
+                    "id": group["_id"],
+                    "group_name": group["name"],
+                    "zones": [
+                        {
+                            "id": zone["_id"],
+                            "name": zone["name"],
+                            "number": zone["number"],
+                            "channels": [
+                                {
+                                    "id": channel["_id"],
+                                    "humidity": channel.get("humidity", 0),
+                                    "demand": channel["demand"],
+                                    "target_temperature": channel["setpoint_used"],
+                                    "current_temperature": channel["temp_zone"],
+                                    "energy_level": channel["mode_permanent"],
+                                    "operating_mode": parse_operating_mode(
+                                        installation["user"]["heatcool_auto_01"]
+                                        if "user" in installation
+                                        else last_operation_mode
+                                    ),
+                                    "setpoints": {
+                                        "cooling": {
+                                            "normal": channel["setpoint_c_normal"],
+                                            "reduced": channel["setpoint_c_reduced"],
+                                        },
+                                        "heating": {
+                                            "normal": channel["setpoint_h_normal"],
+                                            "reduced": channel["setpoint_h_reduced"],
+                                            "standby": channel["setpoint_h_standby"],
+                                        },
+                                        "min": 644,
+                                        "max": 806,
+                                    },
+                                }
+                                for channel in zone["channels"]
+                            ],
+                        }
+                        for zone in group["zones"]
+                    ],
+                }
+                for group in installation["groups"]
+            ],
+        }
+        for installation in installations
+    ]
+
+
+def main():
+    """Run the benchmark."""
+    zones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    installations = [make_installation(zones)]
+
+    legacy = parse_installations_legacy(installations, None)
+    states = parse_installations(installations, None)
+    if [state.to_dict() for state in states] != legacy:
+        raise SystemExit("Parsers disagree")
+
+    # A poll with a handful of changed temperatures, as seen in steady state.
+    poll = copy.deepcopy(installations)
+    for group in poll[0]["groups"][:3]:
+        group["zones"][0]["channels"][0]["temp_zone"] += 1
+    merged, changes = merge_installations(parse_installations(installations, None), poll, None)
+    if [state.to_dict() for state in merged] != parse_installations_legacy(poll, None):
+        raise SystemExit("Merge disagrees with a full parse")
+
+    legacy_time = timeit.timeit(lambda: parse_installations_legacy(installations, None), number=rounds)
+    parse_time = timeit.timeit(lambda: parse_installations(installations, None), number=rounds)
+    merge_time = timeit.timeit(lambda: merge_installations(states, installations, None), number=rounds)
+
+    print(f"installation: {zones} zones, {rounds} rounds, {len(changes)} changes in the sample poll")
+    print(f"legacy parse_installations: {legacy_time / rounds * 1000:8.3f} ms")
+    print(f"single-pass parse:          {parse_time / rounds * 1000:8.3f} ms")
+    print(f"merge of an unchanged poll: {merge_time / rounds * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
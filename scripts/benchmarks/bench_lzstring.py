@@ -0,0 +1,36 @@
+"""Compare the generic LZString decoder with the table-driven UTF-16 decoder.
+
+Usage: python3 scripts/benchmarks/bench_lzstring.py [entries] [rounds]
+"""
+import sys
+import timeit
+
+from fixtures import make_referential_payload
+from utils.lzstring import LZString
+from utils.lzstring_fast import decompress_from_utf16
+
+
+def main():
+    """Run the benchmark."""
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    payload = make_referential_payload(entries)
+
+    expected = LZString.decompressFromUTF16(payload)
+    if decompress_from_utf16(payload) != expected:
+        raise SystemExit("Decoders disagree on the referential payload")
+
+    # Build the lookup table outside of the timed section.
+    decompress_from_utf16(payload)
+
+    legacy = min(timeit.repeat(lambda: LZString.decompressFromUTF16(payload), number=1, repeat=rounds))
+    fast = min(timeit.repeat(lambda: decompress_from_utf16(payload), number=1, repeat=rounds))
+
+    print(f"payload: {entries} entries, {len(payload)} compressed chars, {len(expected)} decoded chars")
+    print(f"LZString.decompressFromUTF16: {legacy * 1000:8.2f} ms")
+    print(f"decompress_from_utf16:        {fast * 1000:8.2f} ms")
+    print(f"speedup:                      {legacy / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
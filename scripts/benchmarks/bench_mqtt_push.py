@@ -0,0 +1,127 @@
+"""Compare the push latency of paho's network thread with the asyncio transport.
+
+With loop_start, paho reads the socket in a thread of its own and every
+message is handed to the event loop with call_soon_threadsafe, as
+hass.create_task does. The asyncio transport reads the socket from the
+event loop, so the message task is created there directly. A minimal
+broker on a local TCP socket publishes timestamped messages, the latency is
+measured from the publish to the start of the message task.
+
+Usage: python3 scripts/benchmarks/bench_mqtt_push.py [messages]
+
+It needs paho-mqtt installed.
+"""
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import paho.mqtt.client as mqtt
+
+from fixtures import CLIENT_DIR  # noqa: F401
+from mqtt_transport import AsyncioMqttTransport
+
+PUBLISH_INTERVAL = 0.005
+
+
+def read_packet(conn):
+    """Read one MQTT packet and return its type."""
+    header = conn.recv(1)
+    if not header:
+        return None
+    length, multiplier = 0, 1
+    while True:
+        byte = conn.recv(1)[0]
+        length += (byte & 0x7F) * multiplier
+        multiplier *= 128
+        if not byte & 0x80:
+            break
+    while length:
+        length -= len(conn.recv(length))
+    return header[0] >> 4
+
+
+def encode_publish(topic, payload):
+    """Encode a QoS 0 PUBLISH packet."""
+    body = len(topic).to_bytes(2, "big") + topic + payload
+    return bytes([0x30, len(body)]) + body
+
+
+def serve(server, messages):
+    """Accept one client and publish timestamped messages once it subscribed."""
+    conn, _ = server.accept()
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    with conn:
+        read_packet(conn)
+        conn.sendall(b"\x20\x02\x00\x00")
+        read_packet(conn)
+        conn.sendall(b"\x90\x03\x00\x01\x00")
+        for _ in range(messages):
+            time.sleep(PUBLISH_INTERVAL)
+            conn.sendall(encode_publish(b"client/test", repr(time.perf_counter()).encode()))
+        conn.settimeout(5)
+        try:
+            while read_packet(conn) is not None:
+                pass
+        except OSError:
+            pass
+
+
+def start_broker(messages):
+    """Start the broker thread and return its port."""
+    server = socket.create_server(("127.0.0.1", 0))
+    threading.Thread(target=serve, args=(server, messages), daemon=True).start()
+    return server.getsockname()[1]
+
+
+async def measure(messages, threaded):
+    """Receive the messages and return the latency of each."""
+    loop = asyncio.get_running_loop()
+    latencies = []
+    done = asyncio.Event()
+
+    async def handle(message):
+        latencies.append(time.perf_counter() - float(message.payload))
+        if len(latencies) == messages:
+            done.set()
+
+    client = mqtt.Client(client_id="bench")
+    client.on_connect = lambda client, userdata, flags, rc: client.subscribe("client/test")
+    port = start_broker(messages)
+    if threaded:
+        client.on_message = lambda client, userdata, message: loop.call_soon_threadsafe(
+            loop.create_task, handle(message)
+        )
+        client.connect("127.0.0.1", port)
+        client.loop_start()
+    else:
+        client.on_message = lambda client, userdata, message: loop.create_task(handle(message))
+        transport = AsyncioMqttTransport(client)
+        await transport.connect("127.0.0.1", port)
+
+    await asyncio.wait_for(done.wait(), 30)
+    client.disconnect()
+    if threaded:
+        client.loop_stop()
+    else:
+        transport.stop()
+    return latencies
+
+
+def report(name, latencies):
+    print(
+        f"{name:<24} median {statistics.median(latencies) * 1e6:7.1f}us"
+        f"  p95 {statistics.quantiles(latencies, n=20)[-1] * 1e6:7.1f}us  max {max(latencies) * 1e6:7.1f}us"
+    )
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    report("paho network thread", asyncio.run(measure(messages, threaded=True)))
+    report("asyncio transport", asyncio.run(measure(messages, threaded=False)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the linear referential key translation, the ReferentialIndex and the compiled encoders.
+
+Usage: python3 scripts/benchmarks/bench_referentials.py [entries] [rounds]
+"""
+import copy
+import sys
+import timeit
+
+from fixtures import make_referentials
+from utils.command_encoder import CommandEncoder
+from utils.referentials import ReferentialIndex, get_by_value, replace_keys
+
+
+def replace_keys_linear(input_object, referentials):
+    """Translate the keys with the linear get_by_value scans used before the index."""
+    if not isinstance(input_object, dict):
+        return input_object
+
+    for key in list(input_object.keys()):
+        if isinstance(input_object[key], list):
+            if get_by_value(key, referentials):
+                index = str(get_by_value(key, referentials)["index"])
+                input_object[index] = [replace_keys_linear(item, referentials) for item in input_object[key]]
+                del input_object[key]
+        elif isinstance(input_object[key], dict):
+            if get_by_value(key, referentials):
+                index = str(get_by_value(key, referentials)["index"])
+                input_object[index] = replace_keys_linear(input_object[key], referentials)
+                del input_object[key]
+        else:
+            if get_by_value(key, referentials):
+                index = str(get_by_value(key, referentials)["index"])
+                input_object[index] = input_object[key]
+                del input_object[key]
+
+    return input_object
+
+
+def make_requests():
+    """Build the requests sent by the Controller commands."""
+    return [
+        {"controller": 0, "data": {"setpoint_used": 680}, "type": "REQ_TH", "zone": "zone-1"},
+        {"controller": 0, "data": {"mode_permanent": 1}, "type": "REQ_TH", "zone": "zone-1"},
+        {"controller": 0, "data": {"mode_used": 1, "zone_impacted": [0, 1, 2, 3]}, "type": "REQ_TH"},
+        {"data": {"heat_cool": "03"}, "type": "REQ_TH"},
+    ]
+
+
+def encode_requests(encoder):
+    """Encode the requests of make_requests with the compiled encoders."""
+    return [
+        encoder.encode_zone_command("zone-1", "setpoint_used", 680),
+        encoder.encode_zone_command("zone-1", "mode_permanent", 1),
+        encoder.encode_global_energy_level(1, [0, 1, 2, 3]),
+        encoder.encode_operation_mode("03"),
+    ]
+
+
+def main():
+    """Run the benchmark."""
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    referentials = make_referentials(entries)
+    index = ReferentialIndex(referentials)
+    encoder = CommandEncoder(index)
+
+    for request, encoded in zip(make_requests(), encode_requests(encoder)):
+        if not replace_keys_linear(copy.deepcopy(request), referentials) == replace_keys(copy.deepcopy(request), index) == encoded:
+            raise SystemExit("Translations disagree for " + str(request))
+
+    build = min(timeit.repeat(lambda: ReferentialIndex(referentials), number=1, repeat=20))
+    linear = timeit.timeit(lambda: [replace_keys_linear(r, referentials) for r in make_requests()], number=rounds)
+    indexed = timeit.timeit(lambda: [replace_keys(r, index) for r in make_requests()], number=rounds)
+    compiled = timeit.timeit(lambda: encode_requests(encoder), number=rounds)
+
+    print(f"referentials: {entries} entries, {rounds} rounds of 4 commands")
+    print(f"ReferentialIndex build:  {build * 1000:8.3f} ms (once per referential update)")
+    print(f"linear replace_keys:     {linear / rounds * 1e6:8.1f} us per round")
+    print(f"indexed replace_keys:    {indexed / rounds * 1e6:8.1f} us per round")
+    print(f"compiled encoders:       {compiled / rounds * 1e6:8.1f} us per round")
+
+
+if __name__ == "__main__":
+    main()
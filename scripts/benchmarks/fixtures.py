@@ -0,0 +1,109 @@
+"""Synthetic payloads shared by the benchmark scripts."""
+import json
+import os
+import random
+import sys
+
+CLIENT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "custom_components", "rehau_nea_smart_2", "rehau_mqtt_client")
+)
+
+# The utils package only depends on the standard library and httpx, so it
+# can be imported on its own without a Home Assistant environment.
+if CLIENT_DIR not in sys.path:
+    sys.path.insert(0, CLIENT_DIR)
+
+REFERENTIAL_NAMES = [
+    "controller", "data", "type", "zone", "zone_impacted", "setpoint_used",
+    "mode_used", "mode_permanent", "heat_cool", "channel", "unique", "demand",
+    "temp_zone", "humidity", "setpoint_h_normal", "setpoint_h_reduced",
+    "setpoint_h_standby", "setpoint_c_normal", "setpoint_c_reduced",
+    "pumpOn", "mixed_circuit1_setpoint", "mixed_circuit1_supply",
+    "mixed_circuit1_return", "mixed_circuit1_opening", "DI", "DO", "MC0",
+]
+
+
+def make_referentials(size: int = 1500, seed: int = 42) -> list[dict]:
+    """Build a referential list shaped like the one sent by the server.
+
+    Args:
+        size (int): The number of referential entries.
+        seed (int): The seed for the generated names.
+
+    Returns:
+        list[dict]: The referential entries.
+    """
+    rng = random.Random(seed)
+    # Spread the names used by the integration over the whole list, so
+    # lookups are not biased towards the head of the list.
+    step = max(size // len(REFERENTIAL_NAMES), 1)
+    known = {position * step: name for position, name in enumerate(REFERENTIAL_NAMES) if position * step < size}
+    referentials = []
+    for index in range(size):
+        value = known.get(index)
+        if value is None:
+            value = "_".join(rng.choice(REFERENTIAL_NAMES) for _ in range(2)) + f"_{index}"
+        referentials.append({"index": f"{index:02d}", "value": value, "type": rng.choice(["int", "str", "bool"])})
+    return referentials
+
+
+def make_referential_payload(size: int = 1500) -> str:
+    """Build a compressed referential payload as received over MQTT.
+
+    Args:
+        size (int): The number of referential entries.
+
+    Returns:
+        str: The referentials as JSON, compressed with LZString to UTF-16.
+    """
+    from utils.lzstring import LZString
+
+    return LZString.compressToUTF16(json.dumps(make_referentials(size)))
+
+
+def make_installation(zones: int = 200, channels_per_zone: int = 1, seed: int = 42) -> dict:
+    """Build an installation as returned by getDataofInstall.
+
+    Args:
+        zones (int): The number of zones, spread over groups of ten.
+        channels_per_zone (int): The number of channels per zone.
+        seed (int): The seed for the generated values.
+
+    Returns:
+        dict: The raw installation data.
+    """
+    rng = random.Random(seed)
+    groups = []
+    for zone_number in range(zones):
+        if zone_number % 10 == 0:
+            groups.append({"_id": f"group-{len(groups)}", "name": f"Group {len(groups)}", "zones": []})
+        channels = [
+            {
+                "_id": f"channel-{zone_number}-{channel_number}",
+                "humidity": rng.randint(30, 70),
+                "demand": rng.choice([0, 0, 0, 100]),
+                "setpoint_used": rng.randint(650, 740),
+                "temp_zone": rng.randint(620, 760),
+                "mode_permanent": rng.choice([0, 0, 0, 1, 2, 3]),
+                "setpoint_c_normal": 740,
+                "setpoint_c_reduced": 770,
+                "setpoint_h_normal": 698,
+                "setpoint_h_reduced": 644,
+                "setpoint_h_standby": 446,
+            }
+            for channel_number in range(channels_per_zone)
+        ]
+        groups[-1]["zones"].append(
+            {"_id": f"zone-{zone_number}", "name": f"Zone {zone_number}", "number": zone_number, "channels": channels}
+        )
+    return {
+        "_id": "installation-0",
+        "unique": "installation-unique-0",
+        "outside_temp": 520,
+        "outsideTempFiltered": 518,
+        "hash": "hash-0",
+        "lastConnection": "2024-01-01T12:00:00.000Z",
+        "connectionState": True,
+        "user": {"heatcool_auto_01": {"heating": 1, "cooling": 0, "manual": 0}},
+        "groups": groups,
+    }